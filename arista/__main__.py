@@ -0,0 +1,3 @@
+from arista.cli import main
+
+main()
@@ -0,0 +1,21 @@
+from .basis import (
+    annualised_basis,
+    constant_maturity_basis,
+    expiry_dates,
+    term_structure,
+)
+from .constant_maturity import ConstantMaturityEngine
+from .signals import EMA, PctChange, RollingZScore, SignalEngine, cross_symbol_rank
+
+__all__ = [
+    "ConstantMaturityEngine",
+    "EMA",
+    "PctChange",
+    "RollingZScore",
+    "SignalEngine",
+    "annualised_basis",
+    "constant_maturity_basis",
+    "cross_symbol_rank",
+    "expiry_dates",
+    "term_structure",
+]
@@ -0,0 +1,158 @@
+"""Vectorised basis and term structure analytics over Deribit futures.
+
+All functions take frames shaped like the `deribit_futures` table, e.g. the
+output of `DeribitFuturesRepository().read_all(as_df=True)`, and operate on
+every asset and timestamp at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+PERPETUAL = "perpetual"
+DAYS_PER_YEAR = 365
+DEFAULT_TENORS = (30, 60, 90)
+GROUP_KEYS = ["asset", "datetime_"]
+
+
+def expiry_dates(instruments: pd.Series) -> pd.Series:
+    """Parse expiry dates from Deribit instrument names, e.g. `BTC-27DEC24`.
+
+    Args:
+        instruments (pd.Series): Deribit instrument names.
+
+    Returns:
+        pd.Series: Expiry dates, `NaT` for perpetuals.
+    """
+    suffix = instruments.str.split("-", n=1).str[1]
+    return pd.to_datetime(suffix, format="%d%b%y", errors="coerce")
+
+
+def annualised_basis(futures: pd.DataFrame) -> pd.DataFrame:
+    """Compute the annualised basis of every dated future against the perpetual.
+
+    The basis is `(future / perpetual - 1) / (days_to_expiry / 365)`, where
+    days to expiry are counted in calendar days, as in the Grafana queries.
+
+    Args:
+        futures (pd.DataFrame): Deribit futures with at least the columns
+            `asset`, `instrument`, `future_reference`, `price` and `datetime_`.
+
+    Returns:
+        pd.DataFrame: One row per dated future and timestamp with the columns
+            `asset`, `datetime_`, `instrument`, `future_reference`, `expiry`,
+            `days_to_expiry`, `price`, `perpetual_price` and `basis`.
+    """
+    columns = ["asset", "datetime_", "instrument", "future_reference", "price"]
+    futures = futures[columns].drop_duplicates(
+        subset=["asset", "datetime_", "instrument"]
+    )
+    futures = futures.assign(datetime_=pd.to_datetime(futures["datetime_"]))
+
+    is_perpetual = futures["future_reference"] == PERPETUAL
+    perpetual = (
+        futures.loc[is_perpetual, GROUP_KEYS + ["price"]]
+        .drop_duplicates(subset=GROUP_KEYS)
+        .rename(columns={"price": "perpetual_price"})
+    )
+    dated = futures.loc[~is_perpetual].merge(perpetual, on=GROUP_KEYS, how="inner")
+
+    expiry = expiry_dates(dated["instrument"])
+    days = (expiry - dated["datetime_"].dt.normalize()).dt.days
+    dated = dated.assign(expiry=expiry, days_to_expiry=days)
+    dated = dated[dated["days_to_expiry"] > 0]
+
+    basis = (dated["price"] / dated["perpetual_price"] - 1) / (
+        dated["days_to_expiry"] / DAYS_PER_YEAR
+    )
+    return (
+        dated.assign(basis=basis)
+        .sort_values(GROUP_KEYS + ["days_to_expiry"])
+        .reset_index(drop=True)
+    )
+
+
+def constant_maturity_basis(
+    basis: pd.DataFrame,
+    tenors: tuple[int, ...] = DEFAULT_TENORS,
+    value: str = "basis",
+) -> pd.DataFrame:
+    """Linearly interpolate a constant maturity value for each tenor.
+
+    For every asset, timestamp and tenor the two maturities bracketing the
+    tenor are located with `merge_asof` and `value` is interpolated on days
+    to expiry. Tenors outside the available maturities are not extrapolated.
+
+    Args:
+        basis (pd.DataFrame): Output of `annualised_basis`.
+        tenors (tuple[int, ...]): Target tenors in days.
+        value (str): Column to interpolate.
+
+    Returns:
+        pd.DataFrame: Columns `asset`, `datetime_`, `tenor` and `value`.
+    """
+    curve = (
+        basis[GROUP_KEYS + ["days_to_expiry", value]]
+        .dropna()
+        .astype({"days_to_expiry": "int64"})
+        .sort_values("days_to_expiry")
+    )
+    keys = curve[GROUP_KEYS].drop_duplicates()
+    targets = keys.merge(
+        pd.DataFrame({"tenor": np.asarray(tenors, dtype="int64")}), how="cross"
+    ).sort_values("tenor")
+
+    def bracket(direction: str, suffix: str) -> pd.DataFrame:
+        return pd.merge_asof(
+            targets,
+            curve.rename(
+                columns={"days_to_expiry": f"days{suffix}", value: f"value{suffix}"}
+            ),
+            left_on="tenor",
+            right_on=f"days{suffix}",
+            by=GROUP_KEYS,
+            direction=direction,
+        )
+
+    lower = bracket("backward", "_lo")
+    upper = bracket("forward", "_hi")
+    merged = lower.merge(upper, on=GROUP_KEYS + ["tenor"])
+
+    span = (merged["days_hi"] - merged["days_lo"]).to_numpy(dtype="float64")
+    weight = np.divide(
+        (merged["tenor"] - merged["days_lo"]).to_numpy(dtype="float64"),
+        span,
+        out=np.zeros_like(span),
+        where=span > 0,
+    )
+    interpolated = merged["value_lo"] + weight * (
+        merged["value_hi"] - merged["value_lo"]
+    )
+
+    return (
+        merged[GROUP_KEYS + ["tenor"]]
+        .assign(**{value: interpolated})
+        .dropna(subset=[value])
+        .sort_values(GROUP_KEYS + ["tenor"])
+        .reset_index(drop=True)
+    )
+
+
+def term_structure(
+    basis: pd.DataFrame,
+    tenors: tuple[int, ...] = tuple(range(7, 371, 7)),
+    value: str = "basis",
+) -> pd.DataFrame:
+    """Build term structure curves on a common tenor grid for all timestamps.
+
+    Args:
+        basis (pd.DataFrame): Output of `annualised_basis`.
+        tenors (tuple[int, ...]): Tenor grid in days.
+        value (str): Column to build the curve for.
+
+    Returns:
+        pd.DataFrame: Indexed by `asset` and `datetime_` with one column per tenor.
+    """
+    points = constant_maturity_basis(basis, tenors=tenors, value=value)
+    return points.pivot_table(
+        index=GROUP_KEYS, columns="tenor", values=value, aggfunc="first"
+    )
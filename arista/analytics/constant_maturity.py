@@ -0,0 +1,132 @@
+"""Incremental constant maturity basis engine.
+
+Instead of picking the single future whose expiry is nearest to a tenor
+(which jumps at every roll), the basis is linearly interpolated between the
+two expiries bracketing each tenor. Only timestamps newer than the last
+stored result minus a lookback window are processed, and results are written
+to the `constant_maturity_basis` table for dashboards to read directly. The
+lookback picks up futures rows that arrive late, e.g. from the buffer or the
+gap repair; older backfills are recomputed with `update(asset, start=...)`.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from arista.analytics.basis import (
+    DEFAULT_TENORS,
+    annualised_basis,
+    constant_maturity_basis,
+)
+from arista.models.constant_maturity import (
+    ConstantMaturityBasisRecord,
+    ConstantMaturityBasisRepository,
+)
+from arista.models.deribit import DeribitFuturesRepository
+
+logger = logging.getLogger(__name__)
+
+ASSETS = ("BTC", "ETH")
+LOOKBACK = timedelta(days=3)
+
+
+class ConstantMaturityEngine:
+    """Compute and store constant maturity basis for new and recent timestamps."""
+
+    def __init__(
+        self,
+        tenors: tuple[int, ...] = DEFAULT_TENORS,
+        assets: tuple[str, ...] = ASSETS,
+        futures_repository: DeribitFuturesRepository = None,
+        output_repository: ConstantMaturityBasisRepository = None,
+        lookback: timedelta = LOOKBACK,
+    ):
+        """Instantiate ConstantMaturityEngine.
+
+        Args:
+            tenors (tuple[int, ...]): Target tenors in days.
+            assets (tuple[str, ...]): Assets to compute the basis for.
+            futures_repository (DeribitFuturesRepository, optional): Source repository.
+            output_repository (ConstantMaturityBasisRepository, optional): Target repository.
+            lookback (timedelta): Window before the last stored result that is
+                recomputed on every run.
+        """
+        self.tenors = tenors
+        self.assets = assets
+        self._futures = futures_repository or DeribitFuturesRepository()
+        self._output = output_repository or ConstantMaturityBasisRepository()
+        self.lookback = lookback
+
+    def run(self, start: datetime = None) -> int:
+        """Update the constant maturity basis for all assets.
+
+        Args:
+            start (datetime, optional): Recompute from this time instead of the
+                lookback window, e.g. after a backfill.
+
+        Returns:
+            int: The number of rows written.
+        """
+        return sum(self.update(asset, start) for asset in self.assets)
+
+    def update(self, asset: str, start: datetime = None) -> int:
+        """Compute the constant maturity basis for new and recent timestamps.
+
+        Points of the recomputed window that are already stored are updated
+        if their basis changed, e.g. because a late futures row arrived.
+
+        Args:
+            asset (str): The asset to update, e.g. BTC.
+            start (datetime, optional): Recompute timestamps after this time.
+                Defaults to the last stored result minus the lookback.
+
+        Returns:
+            int: The number of rows written.
+        """
+        filters = [("asset", asset)]
+        since = start
+        if since is None:
+            since = self._output.max_timestamp(filters=filters)
+            if since is not None:
+                since -= self.lookback
+        futures = self._futures.read_after(
+            since, col="datetime_", filters=filters, as_df=True
+        )
+        if futures.empty:
+            logger.info(f"Constant maturity basis for {asset} is up to date")
+            return 0
+
+        points = constant_maturity_basis(annualised_basis(futures), tenors=self.tenors)
+        records = [
+            ConstantMaturityBasisRecord(*row)
+            for row in zip(
+                points["asset"].tolist(),
+                points["tenor"].tolist(),
+                points["datetime_"].dt.to_pydatetime(),
+                points["basis"].tolist(),
+            )
+        ]
+        return self._store(asset, since, records)
+
+    def _store(self, asset: str, since: datetime | None, records: list) -> int:
+        """Insert new points and update stored points whose basis changed."""
+        stored = {}
+        if since is not None:
+            rows = self._output.where(
+                [("asset", asset), ("datetime_", ">", since)],
+                columns=["tenor", "datetime_", "basis"],
+            )
+            stored = {(row.tenor, row.datetime_): row.basis for row in rows}
+        new = [r for r in records if (r.tenor, r.datetime_) not in stored]
+        changed = [
+            r
+            for r in records
+            if (r.tenor, r.datetime_) in stored
+            and stored[r.tenor, r.datetime_] != r.basis
+        ]
+        logger.info(
+            f"Inserting {len(new)} and updating {len(changed)} constant maturity "
+            f"basis records for {asset} after {since}"
+        )
+        self._output.bulk_create(new)
+        self._output.bulk_update(changed, key=["asset", "tenor", "datetime_"])
+        return len(new) + len(changed)
@@ -0,0 +1,333 @@
+"""Incremental signal engine over open interest and funding rates.
+
+Every operator keeps a constant amount of state per symbol and updates in
+O(1) for each new candle. The engine warms its state up from a bounded tail of
+history (and the last stored EMA) instead of re-reading the full table, and
+persists the resulting signals to the `signals` table.
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from arista.db.repositories import BaseRepository
+from arista.models.funding_rate import FundingRateRepository
+from arista.models.open_interest import OpenInterestRepository
+from arista.models.signal import SignalRecord, SignalRepository
+
+logger = logging.getLogger(__name__)
+
+
+class Operator(ABC):
+    """Base class of an incremental rolling operator."""
+
+    name: str
+    lookback: int = 1
+
+    @abstractmethod
+    def update(self, value: float) -> float | None:
+        """Add a new value and return the current signal, None while warming up."""
+
+    def restore(self, value: float) -> None:
+        """Restore state from the last persisted signal value."""
+
+
+class RollingZScore(Operator):
+    """Z-score of the latest value against a rolling window, using a windowed
+    Welford update to stay numerically stable for large open interest values."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.lookback = window
+        self.name = f"zscore_{window}"
+        self._values = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float) -> float | None:
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            n = len(self._values)
+            delta = old - self._mean
+            self._mean = self._mean - delta / n if n else 0.0
+            self._m2 = max(self._m2 - delta * (old - self._mean), 0.0) if n else 0.0
+
+        self._values.append(value)
+        delta = value - self._mean
+        self._mean += delta / len(self._values)
+        self._m2 += delta * (value - self._mean)
+
+        if len(self._values) < self.window:
+            return None
+        std = math.sqrt(self._m2 / self.window)
+        return (value - self._mean) / std if std > 0 else 0.0
+
+
+class PctChange(Operator):
+    """Percent change over a number of periods."""
+
+    def __init__(self, periods: int = 1):
+        self.periods = periods
+        self.lookback = periods + 1
+        self.name = f"pct_change_{periods}"
+        self._values = deque(maxlen=periods + 1)
+
+    def update(self, value: float) -> float | None:
+        self._values.append(value)
+        if len(self._values) <= self.periods or not self._values[0]:
+            return None
+        return value / self._values[0] - 1
+
+
+class EMA(Operator):
+    """Exponential moving average with span `span`."""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.name = f"ema_{span}"
+        self._alpha = 2 / (span + 1)
+        self._value = None
+
+    def update(self, value: float) -> float | None:
+        if self._value is None:
+            self._value = value
+        else:
+            self._value += self._alpha * (value - self._value)
+        return self._value
+
+    def restore(self, value: float) -> None:
+        self._value = value
+
+
+def default_operators() -> list[Operator]:
+    """Operators computed for every symbol by default."""
+    return [RollingZScore(60), PctChange(1), EMA(14)]
+
+
+class SignalSource(NamedTuple):
+    """Table a signal is computed from."""
+
+    repository: type[BaseRepository]
+    value_col: str
+    timestamp_col: str
+
+
+SOURCES = {
+    "open_interest": SignalSource(
+        OpenInterestRepository, "aggregated_open_interest", "unix_timestamp"
+    ),
+    "funding_rate": SignalSource(FundingRateRepository, "c", "t"),
+}
+
+
+def cross_symbol_rank(values: dict[str, float]) -> dict[str, float]:
+    """Percentile rank of each symbol's value across symbols, ties averaged.
+
+    Args:
+        values (dict[str, float]): Signal value per symbol.
+
+    Returns:
+        dict[str, float]: Rank in [0, 1] per symbol.
+    """
+    if len(values) < 2:
+        return {symbol: 0.5 for symbol in values}
+    ordered = sorted(values.items(), key=lambda item: item[1])
+    ranks, i = {}, 0
+    while i < len(ordered):
+        j = i
+        while j + 1 < len(ordered) and ordered[j + 1][1] == ordered[i][1]:
+            j += 1
+        for symbol, _ in ordered[i : j + 1]:
+            ranks[symbol] = (i + j) / 2 / (len(ordered) - 1)
+        i = j + 1
+    return ranks
+
+
+class SignalEngine:
+    """Compute signals per symbol with O(1) state updates per candle."""
+
+    def __init__(
+        self,
+        source: str = "open_interest",
+        operators: Callable[[], list[Operator]] = default_operators,
+        ranked: tuple[str, ...] = ("pct_change_1", "zscore_60"),
+        source_repository: BaseRepository = None,
+        signal_repository: SignalRepository = None,
+    ):
+        """Instantiate SignalEngine.
+
+        Args:
+            source (str): Source table, one of `SOURCES`.
+            operators (Callable[[], list[Operator]]): Factory of per symbol operators.
+            ranked (tuple[str, ...]): Signals to rank across symbols per timestamp.
+            source_repository (BaseRepository, optional): Repository of the source table.
+            signal_repository (SignalRepository, optional): Repository of the signals table.
+        """
+        self.source = source
+        self._config = SOURCES[source]
+        self._operators = operators
+        self.ranked = ranked
+        self._source = source_repository or self._config.repository()
+        self._signals = signal_repository or SignalRepository()
+        self._states: dict[str, list[Operator]] = {}
+        self._last: dict[str, int | None] = {}
+
+    def update(
+        self, symbol: str, unix_timestamp: int, value: float
+    ) -> list[SignalRecord]:
+        """Feed a new candle for a symbol and return the resulting signals.
+
+        Args:
+            symbol (str): The symbol.
+            unix_timestamp (int): Candle timestamp in seconds.
+            value (float): Candle value.
+
+        Returns:
+            list[SignalRecord]: The signals for this candle.
+        """
+        state = self._states.setdefault(symbol, self._operators())
+        utc = datetime.utcfromtimestamp(unix_timestamp)
+        records = []
+        for operator in state:
+            signal = operator.update(value)
+            if signal is not None:
+                records.append(
+                    SignalRecord(
+                        self.source, symbol, operator.name, signal, unix_timestamp, utc
+                    )
+                )
+        self._last[symbol] = unix_timestamp
+        return records
+
+    def rank(
+        self, records: list[SignalRecord], stored: list = ()
+    ) -> list[SignalRecord]:
+        """Rank signals across symbols for every timestamp of `records`.
+
+        Args:
+            records (list[SignalRecord]): New signals of one or more symbols.
+            stored (list): Signals stored for the same timestamps by earlier
+                runs, so symbols of those runs are ranked as well.
+
+        Returns:
+            list[SignalRecord]: One `rank_<name>` signal per symbol and timestamp.
+        """
+        groups = defaultdict(dict)
+        for record in records:
+            if record.name in self.ranked:
+                groups[(record.name, record.unix_timestamp)][
+                    record.symbol
+                ] = record.value
+        for row in stored:
+            group = groups.get((row.name, row.unix_timestamp))
+            if group is not None:
+                group.setdefault(row.symbol, row.value)
+        ranks = []
+        for (name, unix_timestamp), values in groups.items():
+            utc = datetime.utcfromtimestamp(unix_timestamp)
+            for symbol, rank in cross_symbol_rank(values).items():
+                ranks.append(
+                    SignalRecord(
+                        self.source, symbol, f"rank_{name}", rank, unix_timestamp, utc
+                    )
+                )
+        return ranks
+
+    def _stored_for_ranking(self, records: list[SignalRecord]) -> list:
+        """Read the stored ranked signals and ranks at the timestamps of `records`."""
+        timestamps = [r.unix_timestamp for r in records if r.name in self.ranked]
+        if not timestamps:
+            return []
+        names = list(self.ranked) + [f"rank_{name}" for name in self.ranked]
+        return self._signals.where(
+            [
+                ("source", self.source),
+                ("name", "in", names),
+                ("unix_timestamp", "between", (min(timestamps), max(timestamps))),
+            ],
+            columns=["symbol", "name", "value", "unix_timestamp"],
+        )
+
+    def warm_up(self, symbol: str) -> None:
+        """Rebuild the state of a symbol from a bounded tail of its history."""
+        if symbol in self._states:
+            return
+        state = self._states.setdefault(symbol, self._operators())
+        filters = [("source", self.source), ("symbol", symbol)]
+        last = self._signals.max("unix_timestamp", filters)
+        self._last[symbol] = last
+        if last is None:
+            return
+
+        lookback = max(operator.lookback for operator in state)
+        ts_col, value_col = self._config.timestamp_col, self._config.value_col
+        rows = self._source.where(
+            [("symbol", symbol), (ts_col, "<=", last)],
+            order_by=f"-{ts_col}",
+            limit=lookback,
+            columns=[ts_col, value_col],
+        )
+        for row in reversed(rows):
+            for operator in state:
+                operator.update(getattr(row, self._config.value_col))
+        for operator in state:
+            stored = self._signals.read_last(
+                1, filters=filters + [("name", operator.name)]
+            )
+            if stored:
+                operator.restore(stored[0].value)
+
+    def run(self, symbols: list[str] = None) -> int:
+        """Compute and store signals for candles newer than the last stored signal.
+
+        Args:
+            symbols (list[str], optional): Symbols to update. Defaults to all
+                symbols in the source table.
+
+        Returns:
+            int: The number of signals written.
+        """
+        symbols = symbols or self._source.distinct("symbol")
+        records = []
+        for symbol in symbols:
+            self.warm_up(symbol)
+            ts_col, value_col = self._config.timestamp_col, self._config.value_col
+            filters = [("symbol", symbol)]
+            if self._last.get(symbol) is not None:
+                filters.append((ts_col, ">", self._last[symbol]))
+            rows = self._source.where(
+                filters, order_by=ts_col, columns=[ts_col, value_col]
+            )
+            for row in rows:
+                records.extend(
+                    self.update(
+                        symbol,
+                        int(getattr(row, ts_col)),
+                        getattr(row, value_col),
+                    )
+                )
+        stored = self._stored_for_ranking(records)
+        stored_ranks = {
+            (row.symbol, row.name, row.unix_timestamp): row.value
+            for row in stored
+            if row.name.startswith("rank_")
+        }
+        changed = []
+        for rank in self.rank(records, stored):
+            key = (rank.symbol, rank.name, rank.unix_timestamp)
+            if key not in stored_ranks:
+                records.append(rank)
+            elif stored_ranks[key] != rank.value:
+                changed.append(rank)
+        logger.info(
+            f"Inserting {len(records)} and re-ranking {len(changed)} "
+            f"{self.source} signals"
+        )
+        self._signals.bulk_create(records)
+        self._signals.bulk_update(
+            changed, key=["source", "symbol", "name", "unix_timestamp"]
+        )
+        return len(records) + len(changed)
@@ -0,0 +1,104 @@
+"""Content-addressed on-disk cache for upstream API responses.
+
+Responses are keyed on the endpoint URL and the normalised query parameters
+and stored zlib-compressed in a local SQLite file. Every client decides a TTL
+per request: closed historical windows never change and are cached forever,
+open windows are not cached at all. Re-runs, resumed backfills and development
+iterations are then served locally without spending API quota.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE = "ARISTA_HTTP_CACHE"
+IMMUTABLE = math.inf
+NO_CACHE = 0
+
+
+class ResponseCache:
+    """SQLite backed response cache."""
+
+    def __init__(self, path: str | Path):
+        """Instantiate ResponseCache.
+
+        Args:
+            path (str | Path): Location of the SQLite file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "url TEXT NOT NULL, "
+            "expires_at REAL, "
+            "payload BLOB NOT NULL)"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache | None":
+        """Get a cache at `$ARISTA_HTTP_CACHE`, or None if it is not set."""
+        path = os.environ.get(HTTP_CACHE)
+        return cls(path) if path else None
+
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        """Hash the URL and parameters, ignoring None values and parameter order."""
+        params = {k: str(v) for k, v in (params or {}).items() if v is not None}
+        content = json.dumps([url, params], sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, url: str, params: dict = None):
+        """Get a cached response, or None if it is missing or expired."""
+        row = self._conn.execute(
+            "SELECT expires_at, payload FROM responses WHERE key = ?",
+            (self.key(url, params),),
+        ).fetchone()
+        if row is None or (row[0] is not None and row[0] < time.time()):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(zlib.decompress(row[1]))
+
+    def set(self, url: str, params: dict, data, ttl: float) -> None:
+        """Store a response for `ttl` seconds, `IMMUTABLE` stores it forever.
+
+        Args:
+            url (str): Requested URL.
+            params (dict): Query parameters.
+            data: JSON serialisable response.
+            ttl (float): Time to live in seconds, `NO_CACHE` skips storing.
+        """
+        if ttl <= NO_CACHE:
+            return
+        expires_at = None if ttl == IMMUTABLE else time.time() + ttl
+        payload = zlib.compress(json.dumps(data).encode())
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (self.key(url, params), url, expires_at, payload),
+            )
+
+    def evict_expired(self) -> int:
+        """Delete all expired responses."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at < ?", (time.time(),)
+            )
+        logger.info(f"Evicted {cursor.rowcount} expired responses from {self.path}")
+        return cursor.rowcount
+
+    def close(self):
+        self._conn.close()
@@ -1,13 +1,20 @@
 import logging
 import os
+import time
+from datetime import datetime
 
 import requests
 
-from arista.models.open_interest import OpenInterest
+from arista.api.cache import IMMUTABLE, NO_CACHE, ResponseCache
+from arista.coordination import SharedRateLimiter
+from arista.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, ROWS_FETCHED
+from arista.models.open_interest import OpenInterest, OpenInterestRecord
+from arista.models.records import validate_batch
 
 logger = logging.getLogger(__name__)
 
 RATE_LIMIT_EXCEEDED = "50001"
+INTERVAL_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
 
 
 class CoinglassAPI:
@@ -38,36 +45,87 @@ class CoinglassAPI:
     RESPONSE_LIMIT: int = 4500
     API_KEY = "COINGLASS_API_KEY"
     SOURCE: str = "coinglass"
+    SUPPORTED_COINS_TTL: int = 3600
 
-    def __init__(self):
-        """Instantiate CoinglassAPI."""
+    URL_ENV: str = "COINGLASS_API_URL"
+
+    def __init__(
+        self,
+        cache: ResponseCache = None,
+        base_url: str = None,
+        rate_limiter: SharedRateLimiter = None,
+    ):
+        """Instantiate CoinglassAPI.
+
+        Args:
+            cache (ResponseCache, optional): Response cache, defaults to the
+                cache at `$ARISTA_HTTP_CACHE` if set.
+            base_url (str, optional): API root, e.g. of a local mock server.
+                Defaults to `$COINGLASS_API_URL` or the public API.
+            rate_limiter (SharedRateLimiter, optional): Budget shared with other
+                processes, defaults to a shared limiter if
+                `$ARISTA_SHARED_RATE_LIMITS` is set.
+        """
         logger.info("Initializing CoinglassAPI")
         self._api_key = os.environ.get(self.API_KEY)
         if self._api_key is None:
             raise ValueError(f"{self.API_KEY} not set.")
-        self.base_url = self.URL
+        self.base_url = base_url or os.environ.get(self.URL_ENV) or self.URL
+        self.cache = cache or ResponseCache.from_env()
+        self.rate_limiter = rate_limiter or SharedRateLimiter.from_env(
+            self.SOURCE, self.RATE_LIMIT_REQUESTS_PER_MIN
+        )
 
     def _get_headers(self):
         return {"accept": "application/json", "CG-API-KEY": self._api_key}
 
-    def _get(self, path: str, params=None):
-        """Make a GET request to Coinglass API."""
+    def _get(self, path: str, params=None, ttl: float = NO_CACHE):
+        """Make a GET request to Coinglass API.
+
+        Successful responses are cached for `ttl` seconds if a cache is set.
+        """
         url = f"{self.base_url}{path}"
-        r = requests.get(url, params=params, headers=self._get_headers())
+        if self.cache is not None:
+            data = self.cache.get(url, params)
+            if data is not None:
+                logger.debug(f"Serving {path} with params {params} from cache")
+                HTTP_REQUESTS.labels(self.SOURCE, path, "cache").inc()
+                return data
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with HTTP_REQUEST_SECONDS.labels(self.SOURCE, path).time():
+            r = requests.get(url, params=params, headers=self._get_headers())
+        if not r.ok:
+            HTTP_REQUESTS.labels(self.SOURCE, path, "error").inc()
         r.raise_for_status()
         r = r.json()
         if int(r["code"]) != 0:
             if r["msg"] == RATE_LIMIT_EXCEEDED:
+                HTTP_REQUESTS.labels(self.SOURCE, path, "rate_limited").inc()
                 raise ValueError("Rate limit exceeded.")
+            HTTP_REQUESTS.labels(self.SOURCE, path, "error").inc()
             raise ValueError(r["msg"])
         if r["msg"] == "success" and len(r["data"]) == 0:
+            HTTP_REQUESTS.labels(self.SOURCE, path, "no_data").inc()
             raise ValueError(f"No data returned for {path} with params {params}.")
+        HTTP_REQUESTS.labels(self.SOURCE, path, "ok").inc()
+        ROWS_FETCHED.labels(self.SOURCE, path).inc(len(r["data"]))
+        if self.cache is not None:
+            self.cache.set(url, params, r["data"], ttl)
         return r["data"]
 
+    @staticmethod
+    def _history_ttl(interval: str, end_time: int = None) -> float:
+        """History windows whose last candle has closed never change."""
+        if end_time is None:
+            return NO_CACHE
+        seconds = int(interval[:-1]) * INTERVAL_SECONDS[interval[-1]]
+        return IMMUTABLE if end_time + seconds <= time.time() else NO_CACHE
+
     def get_supported_coins(self) -> dict:
         """Get supported coins for futures trading."""
         path = "/futures/supported-coins"
-        return self._get(path=path)
+        return self._get(path=path, ttl=self.SUPPORTED_COINS_TTL)
 
     def get_aggregated_open_interest_history(
         self,
@@ -76,7 +134,7 @@ class CoinglassAPI:
         response_limit: int = None,
         start_time: int = None,
         end_time: int = None,
-    ) -> list[OpenInterest]:
+    ) -> list[OpenInterestRecord]:
         """Query futures/openInterest/ohlc-aggregated-history
         endpoint from Coinglass API."""
         path = "/futures/openInterest/ohlc-aggregated-history"
@@ -88,16 +146,21 @@ class CoinglassAPI:
             "endTime": end_time,
         }
         logger.info(f"Calling {path} with params {params}")
-        data = self._get(path=path, params=params)
-
-        return [
-            OpenInterest(
-                symbol=symbol,
-                aggregated_open_interest=v["c"],
-                unix_timestamp=v["t"],
+        data = self._get(
+            path=path, params=params, ttl=self._history_ttl(interval, end_time)
+        )
+
+        rows = [
+            (
+                symbol,
+                v["c"],
+                v["t"],
+                datetime.utcfromtimestamp(int(v["t"])),
+                self.SOURCE,
             )
             for v in data
         ]
+        return validate_batch(OpenInterestRecord, rows)
 
     def get_funding_rate_history(
         self,
@@ -1,10 +1,14 @@
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 
 import requests
 
-from arista.models.coinmarketcap import CoinMarketCapHistory
+from arista.api.cache import IMMUTABLE, NO_CACHE, ResponseCache
+from arista.coordination import SharedRateLimiter
+from arista.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, ROWS_FETCHED
+from arista.models.coinmarketcap import CoinMarketCapHistoryRecord
+from arista.models.records import validate_batch
 
 logger = logging.getLogger(__name__)
 
@@ -14,38 +18,81 @@ class CoinMarketCapAPI:
 
     URL: str = "https://pro-api.coinmarketcap.com/v1/cryptocurrency"
     API_KEY = "COINMARKETCAP_API_KEY"
-
-    def __init__(self):
-        """Instantiate CoinMarketCapAPI."""
+    URL_ENV: str = "COINMARKETCAP_API_URL"
+    SOURCE: str = "coinmarketcap"
+    RATE_LIMIT_REQUESTS_PER_MIN: int = 30
+
+    def __init__(
+        self,
+        cache: ResponseCache = None,
+        base_url: str = None,
+        rate_limiter: SharedRateLimiter = None,
+    ):
+        """Instantiate CoinMarketCapAPI.
+
+        Args:
+            cache (ResponseCache, optional): Response cache, defaults to the
+                cache at `$ARISTA_HTTP_CACHE` if set.
+            base_url (str, optional): API root, e.g. of a local mock server.
+                Defaults to `$COINMARKETCAP_API_URL` or the public API.
+            rate_limiter (SharedRateLimiter, optional): Budget shared with other
+                processes, defaults to a shared limiter if
+                `$ARISTA_SHARED_RATE_LIMITS` is set.
+        """
         logger.info("Initializing CoinMarketCapAPI")
         self._api_key = os.environ.get(self.API_KEY)
 
         if self._api_key is None:
             raise ValueError(f"{self.API_KEY} not set.")
-        self.base_url = self.URL
+        self.base_url = base_url or os.environ.get(self.URL_ENV) or self.URL
+        self.cache = cache or ResponseCache.from_env()
+        self.rate_limiter = rate_limiter or SharedRateLimiter.from_env(
+            self.SOURCE, self.RATE_LIMIT_REQUESTS_PER_MIN
+        )
 
     def _get_headers(self):
         return {"accept": "application/json", "X-CMC_PRO_API_KEY": self._api_key}
 
-    def _get(self, path: str, params=None):
-        """Make a GET request to Coinglass API."""
+    def _get(self, path: str, params=None, ttl: float = NO_CACHE):
+        """Make a GET request to CoinMarketCap API.
+
+        Responses are cached for `ttl` seconds if a cache is set.
+        """
         url = f"{self.base_url}{path}"
-        r = requests.get(url, params=params, headers=self._get_headers())
+        if self.cache is not None:
+            data = self.cache.get(url, params)
+            if data is not None:
+                logger.debug(f"Serving {path} with params {params} from cache")
+                HTTP_REQUESTS.labels(self.SOURCE, path, "cache").inc()
+                return data
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with HTTP_REQUEST_SECONDS.labels(self.SOURCE, path).time():
+            r = requests.get(url, params=params, headers=self._get_headers())
+        if not r.ok:
+            outcome = "rate_limited" if r.status_code == 429 else "error"
+            HTTP_REQUESTS.labels(self.SOURCE, path, outcome).inc()
         r.raise_for_status()
         r = r.json()
+        HTTP_REQUESTS.labels(self.SOURCE, path, "ok").inc()
+        ROWS_FETCHED.labels(self.SOURCE, path).inc(len(r["data"]))
+        if self.cache is not None:
+            self.cache.set(url, params, r["data"], ttl)
         return r["data"]
 
-    def listing_latest(self) -> list:
+    def listing_latest(self) -> list[CoinMarketCapHistoryRecord]:
         """Get latest CoinMarketCap listing
         https://pro-api.coinmarketcap.com/v1/cryptocurrency/listings/latest
         """
         path = "/listings/latest"
         data = self._get(path)
 
-        values = [self._json_to_model(d) for d in data]
-        return values
+        values = [self._json_to_record(d) for d in data]
+        return validate_batch(CoinMarketCapHistoryRecord, values)
 
-    def listing_historical(self, date: str = None, datetime_: datetime = None) -> list:
+    def listing_historical(
+        self, date: str = None, datetime_: datetime = None
+    ) -> list[CoinMarketCapHistoryRecord]:
         """Timestamp: ISO timestamp e.g. '2019-10-20'"""
         path = "/listings/historical"
 
@@ -56,19 +103,18 @@ class CoinMarketCapAPI:
                 "Either date or dateteime_ should be passed as function argument."
             )
 
-        data = self._get(path, params={"date": date})
-        values = [self._json_to_model(d, date) for d in data]
-        return values
+        # listings of past days are final
+        today = datetime.now(timezone.utc).date().isoformat()
+        ttl = IMMUTABLE if date < today else NO_CACHE
+        data = self._get(path, params={"date": date}, ttl=ttl)
+        values = [self._json_to_record(d, date) for d in data]
+        return validate_batch(CoinMarketCapHistoryRecord, values)
 
-    def _json_to_model(self, d: dict, date: str = None):
+    def _json_to_record(self, d: dict, date: str = None) -> CoinMarketCapHistoryRecord:
         timestamp_fmt = "%Y-%m-%dT%H:%M:%S.%fZ"
-        date = (
-            date
-            or datetime.strptime(d["last_updated"], timestamp_fmt)
-            .isoformat()
-            .split("T")[0]
-        )
-        return CoinMarketCapHistory(
+        last_updated = datetime.strptime(d["last_updated"], timestamp_fmt)
+        date = date or last_updated.isoformat().split("T")[0]
+        return CoinMarketCapHistoryRecord(
             cmc_rank=d["cmc_rank"],
             cmc_id=d["id"],
             name=d["name"],
@@ -83,6 +129,6 @@ class CoinMarketCapAPI:
             # volume_change_24h=d["quote"]["USD"]["volume_change_24h"],
             market_cap=d["quote"]["USD"]["market_cap"],
             # fully_diluted_market_cap=d["quote"]["USD"]["fully_diluted_market_cap"],
-            utc=datetime.strptime(d["last_updated"], timestamp_fmt),
+            utc=last_updated,
             iso_date=date,
         )
@@ -1,32 +1,19 @@
 import calendar
 import logging
+import os
 import time
 from datetime import datetime, timedelta
 from enum import Enum
 
 import httpx
-from pydantic import BaseModel, Field
 
-# from arista.models.deribit import DeribitFuture
+from arista.api.cache import IMMUTABLE, NO_CACHE, ResponseCache
+from arista.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, ROWS_FETCHED
+from arista.models.deribit import DeribitFutureRecord
 
 logger = logging.getLogger(__name__)
 
 
-class DeribitFuture(BaseModel):
-    asset: str = Field(description="BTC or ETH")
-
-    instrument: str = Field(description="Deribit instrument name")
-    future_reference: str = Field(description="future type")
-    expiration: str | None = Field(description="Expiration date", default=None)
-    price: float = Field(description="Close of the future at timestamp")
-
-    unix_timestamp: int = Field(description="Timestamp of data extraction")
-    datetime_: datetime = Field(
-        description="Datetime of unix timestamp, for readability"
-    )
-    size: int | None = Field(default=None, description="Size of the future contract")
-
-
 class CustomError(Exception):
     pass
 
@@ -49,6 +36,11 @@ class Future(str, Enum):
     perperpetual = "perpetual"
 
 
+def _no_data(data: dict) -> bool:
+    result = data.get("result")
+    return isinstance(result, dict) and result.get("status") == "no_data"
+
+
 class DeribitAPI:
     """Async Deribit API client."""
 
@@ -56,10 +48,21 @@ class DeribitAPI:
     request_timeout = 20
     max_request_connections: int = 50
     DATE_FORMAT = "%Y-%m-%d"
-
-    def __init__(self):
-        """Instantiate CoinMarketCapAPI."""
-        self.base_url = self.URL
+    INSTRUMENTS_TTL: int = 3600
+    URL_ENV: str = "DERIBIT_API_URL"
+    SOURCE: str = "deribit"
+
+    def __init__(self, cache: ResponseCache = None, base_url: str = None):
+        """Instantiate DeribitAPI.
+
+        Args:
+            cache (ResponseCache, optional): Response cache, defaults to the
+                cache at `$ARISTA_HTTP_CACHE` if set.
+            base_url (str, optional): API root, e.g. of a local mock server.
+                Defaults to `$DERIBIT_API_URL` or the public API.
+        """
+        self.base_url = base_url or os.environ.get(self.URL_ENV) or self.URL
+        self.cache = cache or ResponseCache.from_env()
         timeout = httpx.Timeout(self.request_timeout)
         limits = httpx.Limits(
             max_keepalive_connections=self.max_request_connections,
@@ -67,29 +70,56 @@ class DeribitAPI:
         )
         self.client = httpx.AsyncClient(timeout=timeout, limits=limits)
 
-    async def _get(self, path: str, params=None):
-        """Make a GET request to Deribit API."""
+    async def _get(self, path: str, params=None, ttl: float = NO_CACHE):
+        """Make a GET request to Deribit API.
+
+        Responses without an error are cached for `ttl` seconds if a cache is set.
+        `no_data` answers are never cached, as the data may still arrive.
+        """
         url = f"{self.base_url}{path}"
-        r = await self.client.get(url, params=params)
-        return r.json()
+        if self.cache is not None:
+            data = self.cache.get(url, params)
+            if data is not None and not _no_data(data):
+                logger.debug(f"Serving {path} with params {params} from cache")
+                HTTP_REQUESTS.labels(self.SOURCE, path, "cache").inc()
+                return data
+        with HTTP_REQUEST_SECONDS.labels(self.SOURCE, path).time():
+            r = await self.client.get(url, params=params)
+        data = r.json()
+        if "error" in data:
+            outcome = "rate_limited" if r.status_code == 429 else "error"
+        else:
+            outcome = "ok"
+        HTTP_REQUESTS.labels(self.SOURCE, path, outcome).inc()
+        if self.cache is not None and "error" not in data and not _no_data(data):
+            self.cache.set(url, params, data, ttl)
+        return data
 
-    async def get_instruments(self, currency: str) -> list[dict]:
+    async def get_instruments(self, currency: str, expired: bool = True) -> list[dict]:
         path = "/get_instruments"
-        params = {"currency": currency, "kind": "future", "expired": "true"}
-        response = await self._get(path=path, params=params)
+        params = {
+            "currency": currency,
+            "kind": "future",
+            "expired": "true" if expired else "false",
+        }
+        response = await self._get(path=path, params=params, ttl=self.INSTRUMENTS_TTL)
         data = response["result"]
         return data
 
     async def get_instrument(self, instrument_name: str) -> list[dict]:
         path = "/get_instrument"
         params = {"instrument_name": instrument_name}
-        response = await self._get(path=path, params=params)
+        response = await self._get(path=path, params=params, ttl=self.INSTRUMENTS_TTL)
         data = response["result"]
         return data
 
     async def get_tradingview_data(self, params: dict) -> dict:
         path = "/get_tradingview_chart_data"
-        response = await self._get(path=path, params=params)
+        # windows that ended in the past never change
+        closed = params["end_timestamp"] <= time.time() * 1000
+        response = await self._get(
+            path=path, params=params, ttl=IMMUTABLE if closed else NO_CACHE
+        )
         return response
 
     async def get_historical_instruments(
@@ -108,7 +138,7 @@ class DeribitAPI:
 
     async def get_future_data_from_date(
         self, date: datetime, future: Future, symbol: str
-    ) -> DeribitFuture:
+    ) -> DeribitFutureRecord:
         """Get Future data for any date in the past."""
         futures = await self.get_historical_instruments(date)
         data = await self.get_future_data_from_instrument_name(
@@ -126,7 +156,7 @@ class DeribitAPI:
         instrument_name: str,
         symbol: str,
         resolution: int = 360,
-    ) -> DeribitFuture:
+    ) -> DeribitFutureRecord:
         """Get Future data for any date in the past."""
 
         # determine min and max timestamp for current date (i.e 00:00 and 24:00 of any given day)
@@ -153,7 +183,7 @@ class DeribitAPI:
         # assuming usOut is microsecond out?
         record_unix_timestamp = int(int(data["usOut"]) / 1e6)
 
-        record = DeribitFuture(
+        record = DeribitFutureRecord(
             asset=symbol,
             instrument=instrument_name,
             future_reference=future,
@@ -162,6 +192,7 @@ class DeribitAPI:
             unix_timestamp=record_unix_timestamp,
             datetime_=datetime.fromtimestamp(start_timestamp),
         )
+        ROWS_FETCHED.labels(self.SOURCE, "/get_tradingview_chart_data").inc()
         return record
 
     def last_friday(self, year, month):
@@ -0,0 +1,256 @@
+"""Real-time Deribit ingestion over the public WebSocket API.
+
+A single connection subscribes to the ticker channel of every live future and
+the perpetual for the configured assets. Ticks are aggregated into bars in
+memory and closed bars are flushed to `deribit_futures` in micro-batches, so
+the table is fresh within a second instead of every polling interval.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import websockets
+
+from arista.api.deribit import DeribitAPI, Future
+from arista.metrics import RETRIES
+from arista.models.deribit import DeribitFutureRecord, DeribitFuturesRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BarAggregator:
+    """Aggregate ticks per instrument into fixed resolution bars.
+
+    A bar is closed as soon as a tick for a later bucket of the same
+    instrument arrives, or for all instruments by `close_all`, and then
+    becomes available through `drain`.
+    """
+
+    def __init__(self, resolution: int):
+        """Instantiate BarAggregator.
+
+        Args:
+            resolution (int): Bar resolution in seconds.
+        """
+        self.resolution = resolution
+        self._open: dict[str, tuple[int, DeribitFutureRecord]] = {}
+        self._closed: list[DeribitFutureRecord] = []
+
+    def add(
+        self,
+        asset: str,
+        instrument: str,
+        future_reference: str,
+        expiration: str | None,
+        price: float,
+        timestamp_ms: int,
+    ):
+        """Add a tick, closing the current bar of the instrument if needed."""
+        unix_timestamp = timestamp_ms // 1000
+        bucket = unix_timestamp - unix_timestamp % self.resolution
+        current = self._open.get(instrument)
+        if current is not None and current[0] == bucket:
+            bar = current[1]._replace(price=price, unix_timestamp=unix_timestamp)
+        elif current is not None and current[0] > bucket:
+            # late tick for an already closed bar
+            return
+        else:
+            if current is not None:
+                self._closed.append(current[1])
+            bar = DeribitFutureRecord(
+                asset=asset,
+                instrument=instrument,
+                future_reference=future_reference,
+                expiration=expiration,
+                price=price,
+                unix_timestamp=unix_timestamp,
+                datetime_=datetime.fromtimestamp(bucket),
+            )
+        self._open[instrument] = (bucket, bar)
+
+    def close_all(self):
+        """Close the open bar of every instrument, e.g. on shutdown."""
+        self._closed.extend(bar for _, bar in self._open.values())
+        self._open.clear()
+
+    def drain(self) -> list[DeribitFutureRecord]:
+        """Return and forget all closed bars."""
+        closed, self._closed = self._closed, []
+        return closed
+
+    def requeue(self, bars: list[DeribitFutureRecord]):
+        """Put drained bars back, e.g. after a failed write."""
+        self._closed[:0] = bars
+
+
+class DeribitStream:
+    """Stream Deribit futures tickers into the database."""
+
+    URL: str = "wss://test.deribit.com/ws/api/v2"
+    HEARTBEAT_INTERVAL: int = 30
+    RECONNECT_DELAY: int = 5
+    REFRESH_INTERVAL: int = 3600
+
+    def __init__(
+        self,
+        assets: tuple[str, ...] = ("BTC", "ETH"),
+        resolution: int = 60,
+        flush_interval: float = 1.0,
+        url: str = None,
+        api: DeribitAPI = None,
+        repository: DeribitFuturesRepository = None,
+    ):
+        """Instantiate DeribitStream.
+
+        Args:
+            assets (tuple[str, ...]): Assets to subscribe to.
+            resolution (int): Bar resolution in seconds.
+            flush_interval (float): Seconds between two micro-batch flushes.
+            url (str, optional): WebSocket URL, e.g. of a local mock server.
+            api (DeribitAPI, optional): REST client used to list live instruments.
+            repository (DeribitFuturesRepository, optional): Target repository.
+        """
+        self.assets = assets
+        self.flush_interval = flush_interval
+        self.url = url or self.URL
+        self.api = api or DeribitAPI()
+        self.repository = repository or DeribitFuturesRepository()
+        self.aggregator = BarAggregator(resolution)
+        self.instruments: dict[str, dict] = {}
+        self._request_id = 0
+
+    async def refresh_instruments(self) -> dict[str, dict]:
+        """List live futures and the perpetual per asset with their future reference."""
+        instruments = {}
+        for asset in self.assets:
+            references = await self.api.get_historical_instruments(
+                datetime.now(), symbol=asset
+            )
+            by_name = {names[asset]: future for future, names in references.items()}
+            for instrument in await self.api.get_instruments(asset, expired=False):
+                name = instrument["instrument_name"]
+                expiration = None
+                if instrument.get("settlement_period") != Future.perperpetual:
+                    expiration = datetime.fromtimestamp(
+                        instrument["expiration_timestamp"] / 1000
+                    ).strftime(DeribitAPI.DATE_FORMAT)
+                instruments[name] = {
+                    "asset": asset,
+                    "future_reference": by_name.get(
+                        name, instrument.get("settlement_period")
+                    ),
+                    "expiration": expiration,
+                }
+        self.instruments = instruments
+        return instruments
+
+    async def _send(self, ws, method: str, params: dict):
+        self._request_id += 1
+        message = {
+            "jsonrpc": "2.0",
+            "id": self._request_id,
+            "method": method,
+            "params": params,
+        }
+        await ws.send(json.dumps(message))
+
+    async def _subscribe(self, ws, instruments: list[str]):
+        channels = [f"ticker.{name}.100ms" for name in instruments]
+        logger.info(f"Subscribing to {len(channels)} Deribit channels")
+        await self._send(ws, "public/subscribe", {"channels": channels})
+
+    def handle(self, message: dict):
+        """Handle a subscription notification."""
+        data = message["params"]["data"]
+        meta = self.instruments.get(data["instrument_name"])
+        if meta is None:
+            return
+        self.aggregator.add(
+            asset=meta["asset"],
+            instrument=data["instrument_name"],
+            future_reference=meta["future_reference"],
+            expiration=meta["expiration"],
+            price=data.get("last_price") or data["mark_price"],
+            timestamp_ms=data["timestamp"],
+        )
+
+    async def flush(self) -> int:
+        """Write closed bars to the database in one batch.
+
+        Bars rejected by the database are dead-lettered. If the write fails
+        otherwise, the bars are kept for the next flush.
+        """
+        bars = self.aggregator.drain()
+        if not bars:
+            return 0
+        logger.info(f"Flushing {len(bars)} Deribit bars")
+        try:
+            await asyncio.to_thread(
+                self.repository.bulk_create, bars, isolate_errors=True
+            )
+        except Exception:
+            self.repository.rollback()
+            self.aggregator.requeue(bars)
+            raise
+        return len(bars)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush Deribit bars")
+
+    async def _refresh_loop(self, ws):
+        while True:
+            await asyncio.sleep(self.REFRESH_INTERVAL)
+            known = set(self.instruments)
+            new = [
+                name for name in await self.refresh_instruments() if name not in known
+            ]
+            if new:
+                await self._subscribe(ws, new)
+
+    async def consume(self, ws):
+        """Subscribe on an open connection and handle messages until it closes."""
+        await self.refresh_instruments()
+        await self._send(
+            ws, "public/set_heartbeat", {"interval": self.HEARTBEAT_INTERVAL}
+        )
+        await self._subscribe(ws, list(self.instruments))
+        refresh = asyncio.create_task(self._refresh_loop(ws))
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                method = message.get("method")
+                if method == "subscription":
+                    self.handle(message)
+                elif method == "heartbeat":
+                    if message["params"]["type"] == "test_request":
+                        await self._send(ws, "public/test", {})
+                elif "error" in message:
+                    logger.error(f"Deribit error: {message['error']}")
+        finally:
+            refresh.cancel()
+
+    async def run(self):
+        """Stream forever, reconnecting on connection errors."""
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            while True:
+                try:
+                    async with websockets.connect(self.url) as ws:
+                        logger.info(f"Connected to {self.url}")
+                        await self.consume(ws)
+                except (OSError, websockets.ConnectionClosed) as exc:
+                    logger.warning(f"Deribit connection lost: {exc}")
+                    RETRIES.labels("deribit_stream").inc()
+                await asyncio.sleep(self.RECONNECT_DELAY)
+        finally:
+            flusher.cancel()
+            # write the bars still open, a restart would lose them otherwise
+            self.aggregator.close_all()
+            await self.flush()
@@ -0,0 +1,167 @@
+"""Durable local write-ahead buffer between fetchers and the database.
+
+Fetchers append records to a local SQLite queue as soon as they arrive, and a
+flusher drains the queue to Postgres in large batches. Rows are only removed
+from the queue after the database commit succeeded, so a failing insert or a
+crash never loses fetched data. Delivery is at-least-once: a crash between the
+commit and the acknowledgement replays that batch.
+
+Drains of one `RecordBuffer` are serialized, so the scheduler's periodic flush
+and a fetcher flushing its own records never insert the same batch twice. Run
+a single flusher per buffer file.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from arista.db.repositories import BaseRepository
+from arista.models.coinmarketcap import (
+    CoinMarketCapHistoryRecord,
+    CoinMarketCapHistoryRepository,
+)
+from arista.models.dead_letter import DeadLetterRepository
+from arista.models.deribit import DeribitFutureRecord, DeribitFuturesRepository
+from arista.models.open_interest import OpenInterestRecord, OpenInterestRepository
+from arista.models.records import partition_valid
+
+logger = logging.getLogger(__name__)
+
+BUFFER_PATH = "ARISTA_BUFFER_PATH"
+DEFAULT_PATH = Path.home() / ".arista" / "buffer.sqlite"
+
+# table name -> (repository, record type) of every table that can be buffered
+TARGETS = {
+    "deribit_futures": (DeribitFuturesRepository, DeribitFutureRecord),
+    "open_interest": (OpenInterestRepository, OpenInterestRecord),
+    "coinmarketcap": (CoinMarketCapHistoryRepository, CoinMarketCapHistoryRecord),
+}
+
+
+class RecordBuffer:
+    """Append-only SQLite queue of records per target table."""
+
+    BATCH_SIZE: int = 5000
+
+    def __init__(self, path: str | Path = None):
+        """Instantiate RecordBuffer.
+
+        Args:
+            path (str | Path, optional): Location of the SQLite file. Defaults to
+                `$ARISTA_BUFFER_PATH` or `~/.arista/buffer.sqlite`.
+        """
+        self.path = Path(path or os.environ.get(BUFFER_PATH) or DEFAULT_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # the connection is shared by threads, one statement or transaction at
+        # a time, while a drain holds the drain lock across its batches
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buffer ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "target TEXT NOT NULL, "
+            "payload TEXT NOT NULL)"
+        )
+
+    def append(self, target: str, records: list[tuple]) -> None:
+        """Durably append records for a target table.
+
+        Args:
+            target (str): Name of the target table.
+            records (list[tuple]): `NamedTuple` records to buffer.
+        """
+        rows = [(target, json.dumps(record, default=str)) for record in records]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO buffer (target, payload) VALUES (?, ?)", rows
+            )
+
+    def pending(self, target: str = None) -> int:
+        """Count the records waiting to be flushed, optionally for one target."""
+        if target is None:
+            stmt, params = "SELECT COUNT(*) FROM buffer", ()
+        else:
+            stmt, params = "SELECT COUNT(*) FROM buffer WHERE target = ?", (target,)
+        with self._lock:
+            return self._conn.execute(stmt, params).fetchone()[0]
+
+    def targets(self) -> list[str]:
+        """Get the target tables with pending records."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT target FROM buffer").fetchall()
+        return [row[0] for row in rows]
+
+    def drain(
+        self, target: str, repository: BaseRepository = None, batch_size: int = None
+    ) -> int:
+        """Flush all pending records of a target to the database in batches.
+
+        Each batch is acknowledged (deleted from the buffer) only after the
+        database commit succeeded. Concurrent drains wait for each other.
+
+        Args:
+            target (str): Name of the target table.
+            repository (BaseRepository, optional): Repository to write to.
+            batch_size (int, optional): Records per database batch.
+
+        Returns:
+            int: The number of records flushed.
+        """
+        repository_cls, record_type = TARGETS[target]
+        repository = repository or repository_cls()
+        batch_size = batch_size or self.BATCH_SIZE
+
+        with self._drain_lock:
+            return self._drain(target, repository, record_type, batch_size)
+
+    def _drain(
+        self, target: str, repository: BaseRepository, record_type, batch_size: int
+    ) -> int:
+        flushed = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, payload FROM buffer WHERE target = ? ORDER BY id LIMIT ?",
+                    (target, batch_size),
+                ).fetchall()
+            if not rows:
+                break
+            records, invalid = partition_valid(
+                record_type, [json.loads(p) for _, p in rows]
+            )
+            try:
+                # rows failing validation or rejected by the database go to the
+                # dead letters, so one bad record cannot block the buffer
+                if invalid:
+                    logger.warning(
+                        f"Dead-lettering {len(invalid)} invalid buffered records "
+                        f"of {target}: {invalid[0][1]}"
+                    )
+                    letters = DeadLetterRepository.to_records(target, invalid)
+                    DeadLetterRepository().bulk_create(letters)
+                repository.bulk_create(records, isolate_errors=True)
+            except Exception:
+                repository.rollback()
+                logger.exception(f"Failed to flush buffered records to {target}")
+                raise
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "DELETE FROM buffer WHERE target = ? AND id <= ?",
+                    (target, rows[-1][0]),
+                )
+            flushed += len(rows)
+            logger.info(f"Flushed {len(rows)} buffered records to {target}")
+        return flushed
+
+    def drain_all(self) -> int:
+        """Flush the pending records of all targets."""
+        return sum(self.drain(target) for target in self.targets())
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,55 @@
+"""Single `arista` command line with one subcommand per script.
+
+Subcommands are resolved to their script module only when invoked, so starting
+the CLI does not import pandas, SQLAlchemy or any API client.
+
+    arista sync-coinglass
+    arista run-scheduler
+"""
+
+import argparse
+import importlib
+
+# subcommand -> (script module with a `main` function, help)
+COMMANDS = {
+    "sync-coinglass": ("arista.scripts.coinglass", "Sync open interest from Coinglass"),
+    "sync-cmc": (
+        "arista.scripts.coinmarketcap",
+        "Store the latest CoinMarketCap listing",
+    ),
+    "sync-deribit": (
+        "arista.scripts.deribit",
+        "Fetch the latest Deribit futures snapshot",
+    ),
+    "backfill-deribit": ("arista.scripts.deribit_one_off", "Backfill Deribit futures"),
+    "sync-constant-maturity": (
+        "arista.scripts.constant_maturity",
+        "Update the constant maturity basis table",
+    ),
+    "sync-signals": ("arista.scripts.signals", "Update the signals table"),
+    "run-scheduler": ("arista.scripts.scheduler", "Run all collectors as a daemon"),
+    "stream-deribit": ("arista.scripts.deribit_stream", "Stream Deribit tickers"),
+    "flush-buffer": (
+        "arista.scripts.flush_buffer",
+        "Flush the local write-ahead buffer",
+    ),
+    "repair-gaps": ("arista.scripts.repair_gaps", "Fetch missing intervals"),
+    "run-mock-servers": ("arista.scripts.mock_servers", "Run the local API stand-ins"),
+    "plan-backfill": ("arista.scripts.plan_backfill", "Enqueue backfill fetch jobs"),
+    "fetch-worker": ("arista.scripts.fetch_worker", "Claim and run fetch jobs"),
+}
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog="arista", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for name, (_, help_) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_)
+    args = parser.parse_args(argv)
+
+    module = importlib.import_module(COMMANDS[args.command][0])
+    return module.main()
+
+
+if __name__ == "__main__":
+    main()
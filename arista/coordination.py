@@ -0,0 +1,164 @@
+"""Coordination of processes running on any number of hosts through Postgres.
+
+`SharedRateLimiter` draws the requests of every process from one token bucket
+per provider in the `rate_limits` table, so two `sync_coinglass` processes
+share the 30 requests per minute instead of each assuming the full budget.
+Enable it for the API clients with `ARISTA_SHARED_RATE_LIMITS=1`.
+
+`LeaderLock` elects a single leader with a session level advisory lock. The
+lock is held by a dedicated connection and released by Postgres when the
+process dies, after which a standby takes over.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from arista import metrics
+from arista.db.session import get_engine
+
+logger = logging.getLogger(__name__)
+
+SHARED_RATE_LIMITS = "ARISTA_SHARED_RATE_LIMITS"
+
+
+class SharedRateLimiter:
+    """Token bucket shared by all processes using the same database."""
+
+    def __init__(self, name: str, requests_per_min: float, burst: float = 1):
+        """Instantiate SharedRateLimiter.
+
+        Args:
+            name (str): Name of the bucket, e.g. the provider.
+            requests_per_min (float): Budget of all processes together.
+            burst (float): Requests allowed at once after an idle period. The
+                default of 1 spaces requests evenly.
+        """
+        self.name = name
+        self.rate = requests_per_min / 60
+        self.capacity = burst
+        self._repository = None
+
+    @classmethod
+    def from_env(cls, name: str, requests_per_min: float) -> "SharedRateLimiter | None":
+        """Get a shared limiter if `ARISTA_SHARED_RATE_LIMITS` is set."""
+        if not os.environ.get(SHARED_RATE_LIMITS):
+            return None
+        return cls(name, requests_per_min)
+
+    @property
+    def repository(self):
+        if self._repository is None:
+            from arista.models.rate_limit import RateLimitRepository
+
+            self._repository = RateLimitRepository()
+        return self._repository
+
+    def acquire(self, tokens: float = 1):
+        """Block until `tokens` requests may be made."""
+        while wait := self.repository.take(self.name, self.rate, self.capacity, tokens):
+            logger.debug(f"Waiting {wait:.2f}s for the {self.name} rate limit")
+            metrics.wait(self.name, wait)
+
+
+def advisory_key(name: str) -> int:
+    """Map a lock name to a signed 64 bit advisory lock key."""
+    digest = hashlib.sha256(name.encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class LeaderLock:
+    """Leader election with a Postgres session level advisory lock.
+
+    Other databases have no advisory locks, there the lock is always granted,
+    which is correct as long as a single process runs.
+    """
+
+    def __init__(self, name: str, engine: Engine = None):
+        """Instantiate LeaderLock.
+
+        Args:
+            name (str): Name of the elected role, e.g. scheduler.
+            engine (Engine, optional): Defaults to `get_engine()`.
+        """
+        self.name = name
+        self.key = advisory_key(name)
+        self._engine = engine
+        self._conn: Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        return self._engine or get_engine()
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None
+
+    def acquire(self) -> bool:
+        """Try to become the leader without blocking."""
+        if self.held:
+            return True
+        if self.engine.dialect.name != "postgresql":
+            self._conn = self.engine.connect()
+            return True
+        conn = self.engine.connect()
+        try:
+            stmt = text("SELECT pg_try_advisory_lock(:key)")
+            acquired = conn.execute(stmt, {"key": self.key}).scalar_one()
+            # end the implicit transaction, the lock belongs to the session
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        logger.info(f"Acquired leader lock {self.name}")
+        self._conn = conn
+        return True
+
+    def is_leader(self) -> bool:
+        """Check the lock is still held, or try to acquire it.
+
+        A lost connection means Postgres released the lock, and another process
+        may be the leader already.
+        """
+        with self._lock:
+            return self._check()
+
+    def _check(self) -> bool:
+        if self.held:
+            try:
+                self._conn.execute(text("SELECT 1"))
+                self._conn.commit()
+                return True
+            except Exception:
+                logger.exception(f"Lost the connection holding leader lock {self.name}")
+                self._conn.invalidate()
+                self._conn = None
+        return self.acquire()
+
+    def release(self):
+        """Step down as leader."""
+        if not self.held:
+            return
+        try:
+            if self.engine.dialect.name == "postgresql":
+                stmt = text("SELECT pg_advisory_unlock(:key)")
+                self._conn.execute(stmt, {"key": self.key})
+                self._conn.commit()
+                logger.info(f"Released leader lock {self.name}")
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,183 @@
+"""Opt-in statement profiling of the database engine.
+
+Hooks the SQLAlchemy cursor events of an engine and aggregates duration, row
+counts and a sample of the parameters per statement. Statements slower than a
+threshold are explained with `EXPLAIN (ANALYZE, BUFFERS)` on Postgres, and
+sequential scans in their plans are reported, which points at missing indexes
+on columns such as `symbol`, `unix_timestamp` or `datetime_`.
+
+Enable it for the process with `ARISTA_PROFILE_SQL=1` (threshold in
+milliseconds in `ARISTA_PROFILE_SQL_THRESHOLD_MS`), the top statements are
+logged at exit, or attach a `QueryProfiler` to an engine explicitly.
+"""
+
+import atexit
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SQL = "ARISTA_PROFILE_SQL"
+PROFILE_SQL_THRESHOLD_MS = "ARISTA_PROFILE_SQL_THRESHOLD_MS"
+SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+# only plain reads, EXPLAIN ANALYZE runs the data modifying CTEs of a WITH
+EXPLAINABLE = "select"
+
+
+@dataclass
+class StatementStats:
+    """Aggregated executions of one statement."""
+
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    parameters: str = ""
+    plan: str | None = None
+    seq_scans: list[str] = field(default_factory=list)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class QueryProfiler:
+    """Record every statement executed on an engine."""
+
+    def __init__(
+        self,
+        threshold_ms: float = 100.0,
+        explain: bool = True,
+        max_parameters_length: int = 200,
+    ):
+        """Instantiate QueryProfiler.
+
+        Args:
+            threshold_ms (float): Statements slower than this are explained.
+            explain (bool): Whether to capture `EXPLAIN (ANALYZE, BUFFERS)` of
+                slow read statements. Only used on Postgres.
+            max_parameters_length (int): Truncate the recorded parameters.
+        """
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.max_parameters_length = max_parameters_length
+        self.stats: dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._engine: Engine | None = None
+
+    def attach(self, engine: Engine) -> "QueryProfiler":
+        """Start recording the statements of `engine`."""
+        self._engine = engine
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        return self
+
+    def detach(self):
+        """Stop recording."""
+        event.remove(self._engine, "before_cursor_execute", self._before)
+        event.remove(self._engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        # kept on the execution context, so a failing statement leaves no state
+        if context is not None:
+            context.profiler_start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "profiler_start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if getattr(self._local, "explaining", False):
+            return
+        key = " ".join(statement.split())
+        with self._lock:
+            stats = self.stats.setdefault(key, StatementStats(statement=key))
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.rows += max(cursor.rowcount, 0)
+            slowest = elapsed_ms > stats.max_ms
+            if slowest:
+                stats.max_ms = elapsed_ms
+                stats.parameters = repr(parameters)[: self.max_parameters_length]
+        if slowest and elapsed_ms >= self.threshold_ms:
+            logger.warning(f"Slow statement ({elapsed_ms:.0f} ms): {key[:200]}")
+            if self._explainable(conn, key, executemany):
+                self._capture_plan(stats, statement, parameters)
+
+    def _explainable(self, conn, statement: str, executemany: bool) -> bool:
+        return (
+            self.explain
+            and not executemany
+            and conn.dialect.name == "postgresql"
+            and statement.lower().startswith(EXPLAINABLE)
+        )
+
+    def _capture_plan(self, stats: StatementStats, statement: str, parameters):
+        """Explain a read statement on a separate connection."""
+        self._local.explaining = True
+        try:
+            with self._engine.connect() as conn:
+                cursor = conn.connection.cursor()
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+                conn.rollback()
+            stats.plan = plan
+            stats.seq_scans = sorted(set(SEQ_SCAN.findall(plan)))
+        except Exception:
+            logger.exception(f"Could not explain statement: {statement[:200]}")
+        finally:
+            self._local.explaining = False
+
+    def top(self, n: int = 10, by: str = "total_ms") -> list[StatementStats]:
+        """Get the `n` statements with the highest `total_ms`, `max_ms` or `mean_ms`."""
+        with self._lock:
+            stats = list(self.stats.values())
+        return sorted(stats, key=lambda s: getattr(s, by), reverse=True)[:n]
+
+    def report(self, n: int = 10, by: str = "total_ms") -> str:
+        """Format the top `n` statements with their plans."""
+        lines = [f"Top {n} statements by {by}"]
+        for i, stats in enumerate(self.top(n, by), start=1):
+            lines.append(
+                f"{i}. calls={stats.calls} total={stats.total_ms:.1f}ms "
+                f"mean={stats.mean_ms:.1f}ms max={stats.max_ms:.1f}ms "
+                f"rows={stats.rows}"
+            )
+            lines.append(f"   {stats.statement[:500]}")
+            lines.append(f"   parameters of slowest call: {stats.parameters}")
+            if stats.seq_scans:
+                lines.append(f"   sequential scans on: {', '.join(stats.seq_scans)}")
+            if stats.plan:
+                lines.extend(f"   | {line}" for line in stats.plan.splitlines())
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+
+_profiler: QueryProfiler | None = None
+
+
+def get_profiler() -> QueryProfiler | None:
+    """Get the process profiler if profiling is enabled."""
+    return _profiler
+
+
+def enable(engine: Engine, threshold_ms: float = 100.0, top: int = 10):
+    """Profile `engine` for the rest of the process and log a report at exit."""
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    _profiler = QueryProfiler(threshold_ms=threshold_ms).attach(engine)
+    atexit.register(lambda: logger.info(_profiler.report(top)))
+    logger.info(f"Profiling SQL statements slower than {threshold_ms} ms")
+    return _profiler
@@ -1,15 +1,88 @@
-from datetime import datetime
-from typing import Generic, TypeVar
+import base64
+import csv
+import io
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Generic, Iterator, NamedTuple, TypeVar
 
-from pandas import DataFrame
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import ARRAY, and_, any_, bindparam, cast
+from sqlalchemy import column as sa_column
+from sqlalchemy import delete, func, insert, or_, select, table, text, update, values
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError, StatementError
 from sqlmodel import SQLModel
 
 from arista.db.session import get_session
 from arista.exceptions import ItemNotFoundException
+from arista.metrics import ROWS_WRITTEN, timed
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
 
 Model = TypeVar("Model", bound=SQLModel)
 
+# `where_in` lists longer than this are passed as one array, or copied into a
+# temporary table if longer than `WHERE_IN_MAX_ARRAY`
+WHERE_IN_MAX_PARAMETERS = 500
+WHERE_IN_MAX_ARRAY = 50_000
+
+# operator of a `(attr, op, value)` filter -> SQL expression
+OPERATORS = {
+    "==": lambda col, value: col == value,
+    "!=": lambda col, value: col != value,
+    ">": lambda col, value: col > value,
+    ">=": lambda col, value: col >= value,
+    "<": lambda col, value: col < value,
+    "<=": lambda col, value: col <= value,
+    "between": lambda col, value: col.between(*value),
+    "in": lambda col, value: col.in_(value),
+    "not in": lambda col, value: col.not_in(value),
+    "is": lambda col, value: col.is_(value),
+    "is not": lambda col, value: col.is_not(value),
+}
+
+# table name -> `latest` arguments -> (monotonic time, rows)
+_latest_cache: dict[str, dict[tuple, tuple[float, list]]] = {}
+
+
+def _rejects_rows(exc: StatementError) -> bool:
+    """Whether an error is caused by the inserted rows rather than the connection."""
+    if isinstance(exc, (IntegrityError, DataError)):
+        return True
+    return not isinstance(exc, DBAPIError)
+
+
+class Page(NamedTuple):
+    """A page of a keyset paginated read."""
+
+    rows: list
+    # position of the last row, None for an empty page without a position
+    token: str | None
+
+
+def encode_token(col: str, value, object_id: int) -> str:
+    """Encode a keyset position `(col, value, id)` into an opaque token."""
+    if isinstance(value, datetime):
+        value = {"datetime": value.isoformat()}
+    payload = json.dumps([col, value, object_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_token(token: str) -> tuple:
+    """Decode a token of `encode_token` into `(col, value, id)`."""
+    try:
+        col, value, object_id = json.loads(base64.urlsafe_b64decode(token))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid resume token {token!r}") from exc
+    if isinstance(value, dict):
+        value = datetime.fromisoformat(value["datetime"])
+    return col, value, object_id
+
 
 class BaseRepository(Generic[Model]):
     """Generic repository template for all repositories that interact with a table in the database.
@@ -22,10 +95,16 @@ class BaseRepository(Generic[Model]):
     def __init__(self):
         """Initialize the repository with a database session."""
         self._session = get_session()
+        self._pending: list[Model] | None = None
+        self._batch_size = 0
 
+    @timed
     def create(self, obj: Model) -> Model:
         """Create an object in the table.
 
+        Inside `batch()` the object is queued instead, and its ID is set once
+        its batch is flushed.
+
         Args:
             obj (Model): The model object to create.
 
@@ -33,16 +112,173 @@ class BaseRepository(Generic[Model]):
             Model: The created model object with an updated ID.
         """
         new_obj = self._model.model_validate(obj)
+        if self._pending is not None:
+            self._pending.append(new_obj)
+            if len(self._pending) >= self._batch_size:
+                self.flush()
+            return new_obj
         self._session.add(new_obj)
         self._session.commit()
+        self._invalidate_latest()
         self._session.refresh(new_obj)
+        ROWS_WRITTEN.labels(self._model.__tablename__).inc()
         return new_obj
 
-    def bulk_create(self, objs: list[Model]):
-        """Create multiple objects in the table."""
-        self._session.bulk_insert_mappings(self._model, objs)
+    @timed
+    def bulk_create(
+        self,
+        objs: list[Model] | list[tuple],
+        isolate_errors: bool = False,
+        chunk_size: int = 10_000,
+    ) -> int:
+        """Create multiple objects in the table.
+
+        Lightweight `NamedTuple` records are converted straight into insert
+        parameters and executed as a single core `INSERT`, bypassing the ORM.
+
+        With `isolate_errors`, the objects are inserted in chunks of
+        `chunk_size`, each under a savepoint and committed on its own. A chunk
+        rejected by the database, e.g. for a NULL price or a constraint
+        violation, is bisected until the offending rows are found. Those rows
+        are written to the `dead_letters` table with their error, and all other
+        rows are inserted.
+
+        Args:
+            objs (list[Model] | list[tuple]): Model objects or records to insert.
+            isolate_errors (bool): Whether to dead-letter rejected rows instead
+                of failing the whole insert.
+            chunk_size (int): Rows per chunk if `isolate_errors` is set.
+
+        Returns:
+            int: The number of inserted objects.
+        """
+        if not objs:
+            return 0
+        if isolate_errors:
+            return self._bulk_create_isolated(objs, chunk_size)
+        if isinstance(objs[0], tuple):
+            params = [obj._asdict() for obj in objs]
+            self._session.execute(insert(self._model.__table__), params)
+        else:
+            mappings = [self._to_mapping(obj) for obj in objs]
+            self._session.bulk_insert_mappings(self._model, mappings)
         self._session.commit()
+        self._invalidate_latest()
+        ROWS_WRITTEN.labels(self._model.__tablename__).inc(len(objs))
+        return len(objs)
+
+    def _bulk_create_isolated(self, objs: list, chunk_size: int) -> int:
+        from arista.models.dead_letter import DeadLetterRepository
+
+        params = []
+        for obj in objs:
+            mapping = dict(self._to_mapping(obj))
+            if mapping.get("id", 0) is None:
+                del mapping["id"]
+            params.append(mapping)
+
+        table = self._model.__table__
+        inserted = 0
+        for i in range(0, len(params), chunk_size):
+            chunk = params[i : i + chunk_size]
+            count, rejected = self._insert_bisect(chunk)
+            if rejected:
+                logger.warning(
+                    f"Dead-lettering {len(rejected)} of {len(chunk)} rows "
+                    f"rejected by {table.name}: {rejected[0][1]}"
+                )
+                letters = DeadLetterRepository.to_records(table.name, rejected)
+                self._session.execute(
+                    insert(DeadLetterRepository._model.__table__),
+                    [letter._asdict() for letter in letters],
+                )
+            self._session.commit()
+            inserted += count
+        self._invalidate_latest()
+        ROWS_WRITTEN.labels(self._model.__tablename__).inc(inserted)
+        return inserted
+
+    def _insert_bisect(self, params: list[dict]) -> tuple[int, list[tuple[dict, str]]]:
+        """Insert rows under a savepoint, bisecting rejected chunks.
+
+        Returns:
+            tuple[int, list[tuple[dict, str]]]: The number of inserted rows, and
+                the rejected rows with their error.
+        """
+        try:
+            with self._session.begin_nested():
+                self._session.execute(insert(self._model.__table__), params)
+            return len(params), []
+        except StatementError as exc:
+            if not _rejects_rows(exc):
+                raise
+            if len(params) == 1:
+                return 0, [(params[0], str(exc.orig or exc).strip()[:1000])]
+        middle = len(params) // 2
+        left, left_rejected = self._insert_bisect(params[:middle])
+        right, right_rejected = self._insert_bisect(params[middle:])
+        return left + right, left_rejected + right_rejected
+
+    @contextmanager
+    def batch(self, size: int = 1000) -> Iterator["BaseRepository[Model]"]:
+        """Unit of work that turns `create` calls into batched inserts.
+
+        Objects passed to `create` are queued and inserted `size` at a time
+        with a single `INSERT ... RETURNING id` and one commit, instead of an
+        insert, commit and refresh per object. The remaining objects are
+        flushed when the block exits, and dropped if it raises. Nested blocks
+        join the outer one.
+
+            with repository.batch(500):
+                for row in rows:
+                    repository.create(row)
+
+        Args:
+            size (int): Number of queued objects that triggers a flush.
+
+        Yields:
+            BaseRepository[Model]: This repository.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._pending, self._batch_size = [], size
+        try:
+            yield self
+            self.flush()
+        finally:
+            self._pending = None
 
+    @timed
+    def flush(self) -> int:
+        """Insert the objects queued by `create` inside `batch()`.
+
+        Returns:
+            int: The number of inserted objects.
+        """
+        if not self._pending:
+            return 0
+        objs, self._pending = self._pending, []
+        table = self._model.__table__
+        params = [obj.model_dump(exclude={"id"}) for obj in objs]
+        stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        try:
+            ids = self._session.execute(stmt, params).scalars().all()
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        for obj, object_id in zip(objs, ids):
+            obj.id = object_id
+        self._invalidate_latest()
+        ROWS_WRITTEN.labels(self._model.__tablename__).inc(len(objs))
+        return len(objs)
+
+    def rollback(self) -> None:
+        """Roll back the current transaction, e.g. after a failed write."""
+        self._session.rollback()
+
+    @timed
     def delete(self, object_id: int) -> None:
         """Delete an object from the table by its ID.
 
@@ -57,7 +293,9 @@ class BaseRepository(Generic[Model]):
             raise ItemNotFoundException()
         self._session.delete(obj)
         self._session.commit()
+        self._invalidate_latest()
 
+    @timed
     def delete_where(self, attr: str, value: str) -> None:
         """Delete all objects from the table where an attribute matches a given value.
 
@@ -68,7 +306,52 @@ class BaseRepository(Generic[Model]):
         statement = delete(self._model).where(getattr(self._model, attr) == value)
         self._session.execute(statement)
         self._session.commit()
+        self._invalidate_latest()
+
+    @timed
+    def delete_range(
+        self,
+        col: str = None,
+        start: datetime | float = None,
+        end: datetime | float = None,
+        filters: list[tuple] = None,
+        chunk_size: int = 10_000,
+    ) -> int:
+        """Delete the objects with `start <= col < end` in chunks.
+
+        Every chunk of at most `chunk_size` rows is deleted and committed in its
+        own short transaction, so retention jobs do not hold locks on the whole
+        range.
+
+        Args:
+            col (str, optional): The name of the timestamp column. Defaults to `self.timestamp_col`.
+            start (datetime | float, optional): Inclusive lower bound, unbounded if None.
+            end (datetime | float, optional): Exclusive upper bound, unbounded if None.
+            filters (list[tuple], optional): Filters, see `_construct_filter`.
+            chunk_size (int): Maximum number of rows deleted per transaction.
 
+        Returns:
+            int: The number of deleted rows.
+        """
+        column, id_column = self._column(col or self.timestamp_col), self._column("id")
+        expr = self._construct_filter(filters)
+        if start is not None:
+            expr.append(column >= start)
+        if end is not None:
+            expr.append(column < end)
+        chunk = select(id_column).where(and_(*expr)).limit(chunk_size)
+        deleted = 0
+        while True:
+            stmt = delete(self._model).where(id_column.in_(chunk.scalar_subquery()))
+            count = self._session.execute(stmt).rowcount
+            self._session.commit()
+            deleted += count
+            if count < chunk_size:
+                break
+        self._invalidate_latest()
+        return deleted
+
+    @timed
     def read(self, object_id: int) -> Model | None:
         """Read an object from the table by its ID.
 
@@ -106,6 +389,7 @@ class BaseRepository(Generic[Model]):
             return datetime.utcfromtimestamp(max_t) if max_t else None
         return max_t
 
+    @timed
     def max(self, col: str, filters: list[tuple[str, str]]) -> float | None:
         """Get the maximum value of a column, optionally with filters.
 
@@ -141,6 +425,7 @@ class BaseRepository(Generic[Model]):
             return datetime.utcfromtimestamp(min_t) if min_t else None
         return min_t
 
+    @timed
     def min(self, col: str, filters: list[tuple[str, str]]) -> float | None:
         """Get the minimum value of a column, optionally with filters.
 
@@ -156,6 +441,7 @@ class BaseRepository(Generic[Model]):
         result = self._session.execute(stmt)
         return result.scalar()
 
+    @timed
     def read_all(self, as_df: bool = False) -> list[Model] | None:
         """Read all objects from the table.
 
@@ -169,9 +455,233 @@ class BaseRepository(Generic[Model]):
         stmt = select(self._model)
         result = self._session.execute(stmt).scalars().all()
         if as_df:
+            from pandas import DataFrame
+
             return DataFrame([x.model_dump() for x in result])
         return result
 
+    @timed
+    def read_after(
+        self,
+        value: datetime | float | None,
+        col: str = None,
+        filters: list[tuple[str, str]] = None,
+        as_df: bool = False,
+    ) -> "list[Model] | DataFrame":
+        """Read all objects with a timestamp strictly after a given value.
+
+        Args:
+            value (datetime | float | None): Lower bound (exclusive) of the timestamp
+                column. If None, all objects matching the filters are returned.
+            col (str, optional): The name of the timestamp column. Defaults to `self.timestamp_col`.
+            filters (list[tuple[str, str]], optional): A list of filters to apply.
+            as_df (bool): whether to return the results as dataframe.
+
+        Returns:
+            list[Model] | DataFrame: The objects after the given timestamp.
+        """
+        column = getattr(self._model, col or self.timestamp_col)
+        expr = self._construct_filter(filters)
+        if value is not None:
+            expr.append(column > value)
+        stmt = select(self._model).where(and_(*expr)).order_by(column)
+        result = self._session.execute(stmt).scalars().all()
+        if as_df:
+            from pandas import DataFrame
+
+            return DataFrame([x.model_dump() for x in result])
+        return result
+
+    @timed
+    def read_last(
+        self,
+        n: int,
+        col: str = None,
+        filters: list[tuple[str, str]] = None,
+        until: datetime | float | None = None,
+    ) -> list[Model]:
+        """Read the last `n` objects ordered by a timestamp column.
+
+        Args:
+            n (int): The number of objects to read.
+            col (str, optional): The name of the timestamp column. Defaults to `self.timestamp_col`.
+            filters (list[tuple[str, str]], optional): A list of filters to apply.
+            until (datetime | float | None, optional): Upper bound (inclusive) of the
+                timestamp column.
+
+        Returns:
+            list[Model]: The last `n` objects in ascending timestamp order.
+        """
+        column = getattr(self._model, col or self.timestamp_col)
+        expr = self._construct_filter(filters)
+        if until is not None:
+            expr.append(column <= until)
+        stmt = select(self._model).where(and_(*expr)).order_by(column.desc()).limit(n)
+        result = self._session.execute(stmt).scalars().all()
+        return list(reversed(result))
+
+    @timed
+    def latest(
+        self,
+        keys: str | list[str],
+        col: str = None,
+        filters: list[tuple] = None,
+        columns: list[str] = None,
+        cache_ttl: float = None,
+    ) -> list[Model] | list[tuple]:
+        """Read the newest row of every group of `keys` in a single query.
+
+        Uses `DISTINCT ON (keys) ... ORDER BY keys, col DESC` on Postgres, which
+        walks an index on `(*keys, col)` once, and `row_number()` elsewhere.
+
+        Args:
+            keys (str | list[str]): Columns identifying a group, e.g. "symbol"
+                or ["asset", "future_reference"].
+            col (str, optional): The name of the timestamp column. Defaults to `self.timestamp_col`.
+            filters (list[tuple], optional): Filters, see `_construct_filter`.
+            columns (list[str], optional): Only select these columns, the keys
+                and the timestamp column are always added.
+            cache_ttl (float, optional): Serve the result from an in-process
+                cache for up to `cache_ttl` seconds. The cache of a table is
+                cleared by every write of a repository of this process, writes
+                of other processes are seen after the ttl.
+
+        Returns:
+            list[Model] | list[tuple]: The newest object, or row with the
+                selected columns, per group ordered by the keys.
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        col = col or self.timestamp_col
+        cache_key = (tuple(keys), col, repr(filters), tuple(columns or ()))
+        cache = _latest_cache.setdefault(self._model.__tablename__, {})
+        if cache_ttl is not None and cache_key in cache:
+            cached_at, rows = cache[cache_key]
+            if time.monotonic() - cached_at < cache_ttl:
+                return rows
+
+        key_columns = [self._column(key) for key in keys]
+        column, id_column = self._column(col), self._column("id")
+        order = [*key_columns, column.desc(), id_column.desc()]
+        expr = and_(*self._construct_filter(filters))
+        if columns:
+            names = list(dict.fromkeys([*keys, *columns, col]))
+            selected = [self._column(c) for c in names]
+        else:
+            selected = [self._model]
+
+        if self._session.get_bind().dialect.name == "postgresql":
+            stmt = select(*selected).where(expr).distinct(*key_columns).order_by(*order)
+        else:
+            rank = func.row_number().over(partition_by=key_columns, order_by=order[1:])
+            ranked = select(id_column, rank.label("rank")).where(expr).subquery()
+            newest = select(ranked.c.id).where(ranked.c.rank == 1)
+            stmt = select(*selected).where(id_column.in_(newest)).order_by(*key_columns)
+        result = self._session.execute(stmt)
+        rows = result.all() if columns else result.scalars().all()
+
+        if cache_ttl is not None:
+            if not columns:
+                # detach the objects, so they survive commits of this session
+                for obj in rows:
+                    self._session.expunge(obj)
+            cache[cache_key] = (time.monotonic(), rows)
+        return rows
+
+    def _invalidate_latest(self):
+        """Clear the cached `latest` results of the table after a write."""
+        _latest_cache.pop(self._model.__tablename__, None)
+
+    @timed
+    def distinct(self, col: str, filters: list[tuple[str, str]] = None) -> list:
+        """Get the distinct values of a column, optionally with filters.
+
+        Args:
+            col (str): The column to get the distinct values of.
+            filters (list[tuple[str, str]], optional): A list of filters to apply.
+
+        Returns:
+            list: The distinct values.
+        """
+        expr = and_(*self._construct_filter(filters))
+        stmt = select(getattr(self._model, col)).where(expr).distinct()
+        return self._session.execute(stmt).scalars().all()
+
+    @timed
+    def missing_buckets(
+        self,
+        step: timedelta,
+        keys: list[str] = None,
+        col: str = None,
+        start: datetime = None,
+        end: datetime = None,
+    ) -> list[tuple]:
+        """Find the time buckets missing between the first and last row of every key.
+
+        The expected buckets are generated in Postgres with `generate_series`
+        at the cadence `step`, so only the missing buckets leave the database.
+        Buckets are aligned to the epoch, reading naive timestamps as UTC.
+
+        Args:
+            step (timedelta): Expected cadence of the timestamp column.
+            keys (list[str], optional): Columns identifying a series, e.g. ["symbol"].
+            col (str, optional): The name of the datetime column. Defaults to `self.timestamp_col`.
+            start (datetime, optional): Only scan rows at or after this time.
+            end (datetime, optional): Only scan rows at or before this time.
+
+        Returns:
+            list[tuple]: Rows of (*keys, bucket) ordered by keys and bucket.
+
+        Raises:
+            ValueError: If a key or `col` is not a column of the table.
+        """
+        keys = keys or []
+        col = col or self.timestamp_col
+        # names are formatted into the statement, only allow columns
+        for name in keys + [col]:
+            self._column(name)
+        table = self._model.__tablename__
+        bucket = (
+            f"to_timestamp(floor(extract(epoch from {col}) / :step) * :step) "
+            "at time zone 'UTC'"
+        )
+        conditions = ["TRUE"]
+        if start is not None:
+            conditions.append(f"{col} >= :start")
+        if end is not None:
+            conditions.append(f"{col} <= :end")
+        group_by = f"GROUP BY {', '.join(keys)}" if keys else ""
+        columns = ", ".join(keys + ["bucket"])
+        key_select = "".join(f"{key}, " for key in keys)
+
+        stmt = text(
+            f"""
+            WITH actual AS (
+                SELECT DISTINCT {key_select}{bucket} AS bucket
+                FROM {table}
+                WHERE {' AND '.join(conditions)}
+            ),
+            bounds AS (
+                SELECT {key_select}min(bucket) AS start_, max(bucket) AS end_
+                FROM actual
+                {group_by}
+            ),
+            expected AS (
+                SELECT {key_select}generate_series(
+                    start_, end_, make_interval(secs => :step)
+                ) AS bucket
+                FROM bounds
+            )
+            SELECT {columns} FROM expected
+            EXCEPT
+            SELECT {columns} FROM actual
+            ORDER BY {columns}
+            """
+        )
+        params = {"step": step.total_seconds(), "start": start, "end": end}
+        result = self._session.execute(stmt, params)
+        return [tuple(row) for row in result]
+
+    @timed
     def update(self, object_id: int, obj: Model) -> Model:
         """Update an object in the table by its ID.
 
@@ -194,37 +704,284 @@ class BaseRepository(Generic[Model]):
             setattr(db_object, key, value)
 
         self._session.commit()
+        self._invalidate_latest()
         self._session.refresh(db_object)
         return db_object
 
-    def where(self, filters: list[tuple[str, str]]) -> list[Model] | None:
+    @timed
+    def bulk_update(
+        self,
+        rows: list[Model] | list[tuple] | list[dict],
+        key: str | list[str] = "id",
+        chunk_size: int = 1000,
+    ) -> int:
+        """Update many objects by key in chunks.
+
+        Every row holds the key columns and the new values of the columns to
+        update, all rows must set the same columns. The primary key is never
+        updated, so models with an unset `id` can be matched by a natural key.
+        On Postgres each chunk is a single `UPDATE ... FROM (VALUES ...)` joined
+        on the key, elsewhere one executemany `UPDATE` per chunk. Each chunk is
+        committed on its own.
+
+        Args:
+            rows (list[Model] | list[tuple] | list[dict]): Models, records or
+                mappings with the key and the values to set.
+            key (str | list[str]): Column(s) identifying a row, e.g. "id" or
+                ["symbol", "unix_timestamp"].
+            chunk_size (int): Maximum number of rows updated per statement.
+
+        Returns:
+            int: The number of updated rows.
+        """
+        if not rows:
+            return 0
+        keys = [key] if isinstance(key, str) else list(key)
+        mappings = [self._to_mapping(row) for row in rows]
+        columns = [c for c in mappings[0] if c not in keys and c != "id"]
+        for name in keys + columns:
+            self._column(name)
+        if not columns:
+            raise ValueError("Rows contain no columns to update besides the key")
+        table = self._model.__table__
+        postgres = self._session.get_bind().dialect.name == "postgresql"
+
+        updated = 0
+        for i in range(0, len(mappings), chunk_size):
+            chunk = mappings[i : i + chunk_size]
+            if postgres:
+                source = values(
+                    *(sa_column(c, table.c[c].type) for c in keys + columns),
+                    name="source",
+                ).data([tuple(m[c] for c in keys + columns) for m in chunk])
+                # cast, as Postgres types an all NULL column of VALUES as text
+                typed = {c: cast(source.c[c], table.c[c].type) for c in keys + columns}
+                stmt = (
+                    update(table)
+                    .where(and_(*(table.c[k] == typed[k] for k in keys)))
+                    .values({c: typed[c] for c in columns})
+                )
+                result = self._session.execute(stmt)
+            else:
+                stmt = (
+                    update(table)
+                    .where(and_(*(table.c[k] == bindparam(f"key_{k}") for k in keys)))
+                    .values({c: bindparam(c) for c in columns})
+                )
+                params = [
+                    {**{c: m[c] for c in columns}, **{f"key_{k}": m[k] for k in keys}}
+                    for m in chunk
+                ]
+                result = self._session.connection().execute(stmt, params)
+            self._session.commit()
+            updated += max(result.rowcount, 0)
+        self._invalidate_latest()
+        ROWS_WRITTEN.labels(self._model.__tablename__).inc(updated)
+        return updated
+
+    @timed
+    def where(
+        self,
+        filters: list[tuple],
+        order_by: str | list[str] = None,
+        limit: int = None,
+        columns: list[str] = None,
+    ) -> list[Model] | list[tuple]:
         """Filter table by one or more columns where all filters need to be met (AND).
 
+        Filtering, ordering, limiting and projecting all happen in SQL, see
+        `_construct_filter` for the supported filters.
+
         Args:
-            filters (list[tuple[str, str]]): A list of filters to apply.
+            filters (list[tuple]): A list of filters to apply, e.g.
+                `[("symbol", "BTC"), ("unix_timestamp", ">", 1700000000)]`.
+            order_by (str | list[str], optional): Columns to order by, prefixed
+                with `-` for descending order, e.g. `"-unix_timestamp"`.
+            limit (int, optional): Maximum number of rows to return.
+            columns (list[str], optional): Only select these columns.
 
         Returns:
-            list[Model] | None: A list of objects that match all filters, or None if no objects match.
+            list[Model] | list[tuple]: The matching objects, or rows with the
+                selected columns if `columns` is given.
         """
         expr = and_(*self._construct_filter(filters))
-        stmt = select(self._model).where(expr)
+        if columns:
+            stmt = select(*(self._column(c) for c in columns))
+        else:
+            stmt = select(self._model)
+        stmt = stmt.where(expr)
+        if order_by:
+            order_by = [order_by] if isinstance(order_by, str) else order_by
+            stmt = stmt.order_by(*(self._order_by(c) for c in order_by))
+        if limit is not None:
+            stmt = stmt.limit(limit)
         result = self._session.execute(stmt)
-        return result.scalars().all()
+        return result.all() if columns else result.scalars().all()
 
-    def where_in(self, attr: str, values: list[str]) -> list[Model] | None:
+    @timed
+    def where_in(
+        self,
+        attr: str,
+        values: list,
+        stream: bool = False,
+        batch_size: int = 10_000,
+    ) -> list[Model] | Iterator[Model]:
         """Filter table by an attribute where the attribute value is in a list of values.
 
+        The strategy depends on the number of distinct values, see
+        `where_in_strategy`: a plain `IN (...)` for short lists, and on
+        Postgres `= ANY(:values)` with a single array parameter for medium lists
+        and a join against a temporary table filled with `COPY` for huge lists.
+        Other databases look up huge lists in chunks of `IN (...)`.
+
         Args:
             attr (str): The attribute to filter by.
-            values (list[str]): A list of values to filter by.
+            values (list): A list of values to filter by.
+            stream (bool): Whether to return an iterator that fetches the rows
+                in batches (with a server side cursor on Postgres) instead of
+                loading them all at once.
+            batch_size (int): Rows fetched per batch when streaming.
 
         Returns:
-            list[Model] | None: A list of objects that match the filter, or None if no objects match.
+            list[Model] | Iterator[Model]: The objects that match the filter.
         """
-        stmt = select(self._model).where(getattr(self._model, attr).in_(values))
+        column = self._column(attr)
+        values = list(dict.fromkeys(values))
+        strategy = self.where_in_strategy(len(values))
+        if strategy == "temp_table":
+            rows = self._where_in_temp_table(column, values, batch_size)
+        elif strategy == "chunked":
+            rows = self._where_in_chunked(column, values, batch_size)
+        else:
+            if strategy == "any":
+                array = bindparam(f"{attr}_values", values, type_=ARRAY(column.type))
+                expr = column == any_(array)
+            else:
+                expr = column.in_(values)
+            rows = self._stream(select(self._model).where(expr), batch_size)
+        return rows if stream else list(rows)
+
+    def where_in_strategy(self, n: int) -> str:
+        """Get the `where_in` strategy for `n` values: in, any, temp_table or chunked."""
+        if n <= WHERE_IN_MAX_PARAMETERS:
+            return "in"
+        if self._session.get_bind().dialect.name != "postgresql":
+            return "chunked"
+        if n <= WHERE_IN_MAX_ARRAY:
+            return "any"
+        return "temp_table"
+
+    def _stream(self, stmt, batch_size: int) -> Iterator[Model]:
+        stmt = stmt.execution_options(yield_per=batch_size)
+        yield from self._session.execute(stmt).scalars()
+
+    def _where_in_chunked(self, column, values: list, batch_size: int):
+        for i in range(0, len(values), WHERE_IN_MAX_PARAMETERS):
+            chunk = values[i : i + WHERE_IN_MAX_PARAMETERS]
+            yield from self._stream(
+                select(self._model).where(column.in_(chunk)), batch_size
+            )
+
+    def _where_in_temp_table(self, column, values: list, batch_size: int):
+        """Copy the values into a temporary table and join it."""
+        conn = self._session.connection()
+        name = f"where_in_{uuid.uuid4().hex[:12]}"
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(
+            text(f"CREATE TEMPORARY TABLE {name} (value {column_type}) ON COMMIT DROP")
+        )
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows((value,) for value in values)
+        buffer.seek(0)
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(f"COPY {name} (value) FROM STDIN WITH (FORMAT csv)", buffer)
+        conn.execute(text(f"ANALYZE {name}"))
+        keys = table(name, sa_column("value"))
+        stmt = select(self._model).join(keys, column == keys.c.value)
+        try:
+            yield from self._stream(stmt, batch_size)
+        finally:
+            conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+    @timed
+    def read_page(
+        self,
+        size: int = 1000,
+        after: str = None,
+        filters: list[tuple] = None,
+        col: str = None,
+        columns: list[str] = None,
+    ) -> Page:
+        """Read the next page of rows in `(col, id)` order.
+
+        The page starts strictly after the position in `after` with a range
+        predicate on the timestamp column, so every page costs the same index
+        seek however deep into the table it is, unlike `OFFSET`.
+
+        Args:
+            size (int): Maximum number of rows of the page.
+            after (str, optional): Resume token of a previous page. Defaults to
+                the start of the table.
+            filters (list[tuple], optional): Filters, see `_construct_filter`.
+                Pass the same filters for every page of a walk.
+            col (str, optional): The name of the timestamp column. Defaults to `self.timestamp_col`.
+            columns (list[str], optional): Only select these columns, the
+                timestamp column and `id` are always added.
+
+        Returns:
+            Page: The rows and the token to resume after the last row.
+
+        Raises:
+            ValueError: If the token was issued for another column.
+        """
+        col = col or self.timestamp_col
+        column, id_column = self._column(col), self._column("id")
+        expr = self._construct_filter(filters)
+        if after is not None:
+            token_col, value, object_id = decode_token(after)
+            if token_col != col:
+                raise ValueError(f"Resume token is for column {token_col}, not {col}")
+            # `column >= value` is the indexable range, the rest breaks ties on id
+            expr.append(column >= value)
+            expr.append(or_(column > value, id_column > object_id))
+        if columns:
+            names = list(dict.fromkeys([*columns, col, "id"]))
+            stmt = select(*(self._column(c) for c in names))
+        else:
+            stmt = select(self._model)
+        stmt = stmt.where(and_(*expr)).order_by(column, id_column).limit(size)
         result = self._session.execute(stmt)
-        return result.scalars().all()
+        rows = result.all() if columns else result.scalars().all()
+        if not rows:
+            return Page(rows=rows, token=after)
+        last = rows[-1]
+        return Page(rows=rows, token=encode_token(col, getattr(last, col), last.id))
+
+    def iter_pages(
+        self,
+        size: int = 1000,
+        after: str = None,
+        filters: list[tuple] = None,
+        col: str = None,
+        columns: list[str] = None,
+    ) -> Iterator[Page]:
+        """Walk the table in pages of `size` rows, see `read_page`.
+
+        Store the token of the last processed page to resume the walk later,
+        e.g. after a crash, or to pick up rows inserted in the meantime.
 
+        Yields:
+            Page: Non-empty pages until a page is shorter than `size`.
+        """
+        while True:
+            page = self.read_page(size, after, filters, col, columns)
+            if page.rows:
+                yield page
+            if len(page.rows) < size:
+                return
+            after = page.token
+
+    @timed
     def query(self, query: str) -> list[Model]:
         """Execute a custom query.
 
@@ -237,19 +994,55 @@ class BaseRepository(Generic[Model]):
         result = self._session.execute(query)
         return result.scalars().all()
 
-    def _construct_filter(self, filters: list[tuple[str, str]]) -> list:
-        """Construct a filter list from tuples of attribute-value pairs.
+    @staticmethod
+    def _to_mapping(obj: Model | tuple | dict) -> dict:
+        """Convert a record, model or mapping into a column mapping."""
+        if isinstance(obj, tuple):
+            return obj._asdict()
+        if isinstance(obj, dict):
+            return obj
+        return obj.model_dump()
+
+    def _column(self, attr: str):
+        """Get the column of an attribute, raising ValueError on unknown names."""
+        if attr not in self._model.__table__.columns:
+            raise ValueError(f"{self._model.__tablename__} has no column {attr}")
+        return getattr(self._model, attr)
+
+    def _order_by(self, col: str):
+        if col.startswith("-"):
+            return self._column(col[1:]).desc()
+        return self._column(col)
+
+    def _construct_filter(self, filters: list[tuple]) -> list:
+        """Construct a filter list from attribute-value pairs or operator triples.
+
+        Pairs `(attr, value)` test equality and are skipped if the value is None.
+        Triples `(attr, op, value)` support the operators in `OPERATORS`, where
+        `between` expects a `(low, high)` tuple (both inclusive) and `in` a list.
+        Compare with None using `is` and `is not`.
 
         Args:
-            filters (list[tuple[str, str]]): A list of tuples where each tuple contains an
-                attribute and the value to filter by. E.g., [("name", "John"), ("age", 25)].
+            filters (list[tuple]): A list of filters, e.g.
+                `[("symbol", "BTC"), ("utc", "between", (start, end))]`.
 
         Returns:
             list: A list of SQLAlchemy filter expressions.
+
+        Raises:
+            ValueError: If a column or operator is unknown.
         """
         filter_list = []
-        if filters:
-            for expr in filters:
-                if expr[1] is not None:
-                    filter_list.append(getattr(self._model, expr[0]) == expr[1])
+        for expr in filters or []:
+            if len(expr) == 2:
+                attr, value = expr
+                if value is not None:
+                    filter_list.append(self._column(attr) == value)
+                continue
+            attr, op, value = expr
+            if op not in OPERATORS:
+                raise ValueError(
+                    f"Unknown operator {op}, expected one of {list(OPERATORS)}"
+                )
+            filter_list.append(OPERATORS[op](self._column(attr), value))
         return filter_list
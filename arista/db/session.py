@@ -4,6 +4,8 @@ from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
 
+from arista.db import profiling
+
 
 @lru_cache
 def get_async_engine():
@@ -16,11 +18,18 @@ def get_async_engine():
 
 @lru_cache
 def get_engine():
-    """Get a cached database engine."""
+    """Get a cached database engine.
+
+    Statements are profiled if `ARISTA_PROFILE_SQL` is set, see `arista.db.profiling`.
+    """
     postgres_url = os.environ.get("POSTGRES_DATABASE_URL")
     if postgres_url is None:
         raise ValueError("POSTGRES_DATABASE_URL not set.")
-    return create_engine(postgres_url)
+    engine = create_engine(postgres_url)
+    if os.environ.get(profiling.PROFILE_SQL):
+        threshold_ms = float(os.environ.get(profiling.PROFILE_SQL_THRESHOLD_MS, 100))
+        profiling.enable(engine, threshold_ms=threshold_ms)
+    return engine
 
 
 def get_async_session() -> AsyncSession:
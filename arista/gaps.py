@@ -0,0 +1,193 @@
+"""Gap detection and targeted repair across the time series tables.
+
+Syncs only compare against the latest stored timestamp, so holes in the middle
+of a series are never filled. The scanner computes the missing buckets per key
+in Postgres at the expected cadence of each table, and the repairer hands only
+those buckets to the fetchers, so a repair costs requests proportional to the
+size of the gaps rather than to the full history.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import NamedTuple
+
+from arista.api.coinglass import CoinglassAPI
+from arista.api.coinmarketcap import CoinMarketCapAPI
+from arista.api.deribit import DeribitAPI
+from arista.db.repositories import BaseRepository
+from arista.models.coinmarketcap import CoinMarketCapHistoryRepository
+from arista.models.deribit import DeribitFuturesRepository
+from arista.models.open_interest import OpenInterestRepository
+
+logger = logging.getLogger(__name__)
+
+OPEN_INTEREST_INTERVAL = "12h"
+DERIBIT_RESOLUTION = 360
+
+
+class Cadence(NamedTuple):
+    """Expected cadence of a time series table."""
+
+    repository: type[BaseRepository]
+    keys: list[str]
+    col: str
+    step: timedelta
+
+
+CADENCES = {
+    "open_interest": Cadence(
+        OpenInterestRepository, ["symbol"], "utc", timedelta(hours=12)
+    ),
+    # `datetime_` is the local time of the fetching host (`fromtimestamp`), the
+    # buckets are only aligned to the 6h resolution if hosts run in UTC
+    "deribit_futures": Cadence(
+        DeribitFuturesRepository,
+        ["asset", "future_reference"],
+        "datetime_",
+        timedelta(minutes=DERIBIT_RESOLUTION),
+    ),
+    # the 4h syncs can only be repaired from the daily historical listing
+    "coinmarketcap": Cadence(
+        CoinMarketCapHistoryRepository, [], "utc", timedelta(days=1)
+    ),
+}
+
+
+class Gap(NamedTuple):
+    """Contiguous run of missing buckets of one series."""
+
+    key: tuple
+    start: datetime
+    end: datetime
+    buckets: list[datetime]
+
+
+def find_gaps(
+    table: str,
+    start: datetime = None,
+    end: datetime = None,
+    repository: BaseRepository = None,
+) -> list[Gap]:
+    """Find the gaps of a table at its expected cadence.
+
+    Args:
+        table (str): Name of the table, one of `CADENCES`.
+        start (datetime, optional): Only scan rows at or after this time.
+        end (datetime, optional): Only scan rows at or before this time.
+        repository (BaseRepository, optional): Repository of the table.
+
+    Returns:
+        list[Gap]: Contiguous runs of missing buckets per key.
+    """
+    cadence = CADENCES[table]
+    repository = repository or cadence.repository()
+    rows = repository.missing_buckets(
+        cadence.step, keys=cadence.keys, col=cadence.col, start=start, end=end
+    )
+
+    gaps = []
+    for key, group in groupby(rows, key=lambda row: row[:-1]):
+        buckets = [row[-1] for row in group]
+        run = [buckets[0]]
+        for bucket in buckets[1:]:
+            if bucket - run[-1] > cadence.step:
+                gaps.append(Gap(key, run[0], run[-1], run))
+                run = []
+            run.append(bucket)
+        gaps.append(Gap(key, run[0], run[-1], run))
+
+    missing = sum(len(gap.buckets) for gap in gaps)
+    logger.info(f"Found {len(gaps)} gaps with {missing} missing buckets in {table}")
+    return gaps
+
+
+def _utc_timestamp(dt: datetime) -> int:
+    return int(dt.replace(tzinfo=timezone.utc).timestamp())
+
+
+class GapRepairer:
+    """Fetch only the missing buckets of each table and insert them."""
+
+    def __init__(
+        self,
+        coinglass: CoinglassAPI = None,
+        deribit: DeribitAPI = None,
+        cmc: CoinMarketCapAPI = None,
+    ):
+        """Instantiate GapRepairer, clients are created on first use."""
+        self._coinglass = coinglass
+        self._deribit = deribit
+        self._cmc = cmc
+
+    def repair_open_interest(
+        self, gaps: list[Gap], repository: OpenInterestRepository = None
+    ) -> int:
+        """Fetch one Coinglass window per gap and insert the missing candles."""
+        self._coinglass = self._coinglass or CoinglassAPI()
+        repository = repository or OpenInterestRepository()
+        inserted = 0
+        for gap in gaps:
+            (symbol,) = gap.key
+            try:
+                records = self._coinglass.get_aggregated_open_interest_history(
+                    symbol=symbol,
+                    interval=OPEN_INTEREST_INTERVAL,
+                    start_time=_utc_timestamp(gap.start),
+                    end_time=_utc_timestamp(gap.end),
+                )
+            except ValueError as exc:
+                logger.error(
+                    f"Could not repair {symbol} {gap.start} - {gap.end}: {exc}"
+                )
+                continue
+            missing = set(gap.buckets)
+            records = [r for r in records if r.utc in missing]
+            inserted += repository.bulk_create(records, isolate_errors=True)
+        return inserted
+
+    async def repair_deribit(
+        self, gaps: list[Gap], repository: DeribitFuturesRepository = None
+    ) -> int:
+        """Fetch each missing Deribit bucket and insert it."""
+        self._deribit = self._deribit or DeribitAPI()
+        repository = repository or DeribitFuturesRepository()
+        resolution = timedelta(minutes=DERIBIT_RESOLUTION)
+        records = []
+        for gap in gaps:
+            asset, future = gap.key
+            for bucket in gap.buckets:
+                # the snapshot for `date` covers the bucket starting one resolution earlier
+                date = bucket + resolution
+                try:
+                    instruments = await self._deribit.get_historical_instruments(
+                        date=date, symbol=asset
+                    )
+                    record = await self._deribit.get_future_data_from_instrument_name(
+                        date=date,
+                        future=future,
+                        instrument_name=instruments[future][asset],
+                        symbol=asset,
+                        resolution=DERIBIT_RESOLUTION,
+                    )
+                except (ValueError, KeyError) as exc:
+                    logger.error(f"Could not repair {asset} {future} {bucket}: {exc}")
+                    continue
+                records.append(record)
+        return repository.bulk_create(records, isolate_errors=True)
+
+    def repair_coinmarketcap(
+        self, gaps: list[Gap], repository: CoinMarketCapHistoryRepository = None
+    ) -> int:
+        """Fetch the historical listing of each missing day without any rows."""
+        self._cmc = self._cmc or CoinMarketCapAPI()
+        repository = repository or CoinMarketCapHistoryRepository()
+        dates = sorted({bucket.date() for gap in gaps for bucket in gap.buckets})
+        inserted = 0
+        for date in dates:
+            date = date.isoformat()
+            if repository.max("utc", [("iso_date", date)]) is not None:
+                continue
+            records = self._cmc.listing_historical(date=date)
+            inserted += repository.bulk_create(records, isolate_errors=True)
+        return inserted
@@ -0,0 +1,255 @@
+"""Distributed backfills over the shared `fetch_jobs` table.
+
+A backfill is planned once as one job per (provider, endpoint, key, window).
+Any number of `FetchWorker` processes on any number of hosts then claim jobs
+with `SELECT ... FOR UPDATE SKIP LOCKED`, fetch their window and settle them.
+Each job's lease is renewed right before the worker starts it. A worker that
+crashes stops renewing its leases, and its jobs are picked up by another
+worker once the lease expired, or failed if that was their final attempt.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+
+from arista.api.coinglass import CoinglassAPI
+from arista.api.coinmarketcap import CoinMarketCapAPI
+from arista.api.deribit import DeribitAPI, Future
+from arista.models.coinmarketcap import CoinMarketCapHistoryRepository
+from arista.models.deribit import DeribitFuturesRepository
+from arista.models.fetch_job import FetchJobRecord, FetchJobRepository, FetchJobTable
+from arista.models.open_interest import OpenInterestRepository
+
+logger = logging.getLogger(__name__)
+
+OPEN_INTEREST = ("coinglass", "open_interest")
+DERIBIT_FUTURES = ("deribit", "tradingview_chart_data")
+CMC_HISTORICAL = ("coinmarketcap", "listings_historical")
+
+OPEN_INTEREST_INTERVAL = "12h"
+DERIBIT_RESOLUTION = 360
+
+
+def plan_open_interest(
+    symbols: list[str],
+    start: datetime,
+    end: datetime,
+    candles_per_job: int = CoinglassAPI.RESPONSE_LIMIT,
+) -> list[FetchJobRecord]:
+    """One job per symbol and window of at most `candles_per_job` 12h candles."""
+    step = timedelta(hours=12) * candles_per_job
+    jobs = []
+    for symbol in symbols:
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + step, end)
+            jobs.append(
+                FetchJobRecord(*OPEN_INTEREST, symbol, window_start, window_end)
+            )
+            window_start = window_end
+    return jobs
+
+
+def plan_deribit(
+    assets: list[str],
+    start: datetime,
+    end: datetime,
+    resolution: int = DERIBIT_RESOLUTION,
+) -> list[FetchJobRecord]:
+    """One job per asset, future and bucket of `resolution` minutes."""
+    step = timedelta(minutes=resolution)
+    jobs = []
+    bucket = start
+    while bucket < end:
+        for asset in assets:
+            for future in Future:
+                key = f"{asset}:{future.value}"
+                jobs.append(
+                    FetchJobRecord(*DERIBIT_FUTURES, key, bucket, bucket + step)
+                )
+        bucket += step
+    return jobs
+
+
+def plan_coinmarketcap(start: datetime, end: datetime) -> list[FetchJobRecord]:
+    """One job per day of historical listings."""
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    jobs = []
+    while day < end:
+        jobs.append(FetchJobRecord(*CMC_HISTORICAL, "", day, day + timedelta(days=1)))
+        day += timedelta(days=1)
+    return jobs
+
+
+def _utc_timestamp(dt: datetime) -> int:
+    return int((dt - datetime(1970, 1, 1)).total_seconds())
+
+
+class FetchWorker:
+    """Claim fetch jobs, fetch their window and insert the new rows."""
+
+    def __init__(
+        self,
+        name: str = None,
+        repository: FetchJobRepository = None,
+        lease: timedelta = timedelta(minutes=10),
+        batch_size: int = 10,
+        provider: str = None,
+    ):
+        """Instantiate FetchWorker, clients and repositories are created on first use.
+
+        Args:
+            name (str, optional): Worker name stored with its leases. Defaults
+                to `<hostname>-<pid>`.
+            repository (FetchJobRepository, optional): Job queue.
+            lease (timedelta): Lease of claimed jobs, renewed before each job
+                is started, must exceed the time to process one job.
+            batch_size (int): Jobs claimed at once.
+            provider (str, optional): Only work on jobs of this provider.
+        """
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.jobs = repository or FetchJobRepository()
+        self.lease = lease
+        self.batch_size = batch_size
+        self.provider = provider
+        self._clients: dict = {}
+        self._repositories: dict = {}
+        self._loop = asyncio.new_event_loop()
+        self._handlers = {
+            OPEN_INTEREST: self.fetch_open_interest,
+            DERIBIT_FUTURES: self.fetch_deribit,
+            CMC_HISTORICAL: self.fetch_coinmarketcap,
+        }
+
+    def _client(self, cls):
+        if cls not in self._clients:
+            self._clients[cls] = cls()
+        return self._clients[cls]
+
+    def _repository(self, cls):
+        if cls not in self._repositories:
+            self._repositories[cls] = cls()
+        return self._repositories[cls]
+
+    def fetch_open_interest(self, job: FetchJobTable) -> int:
+        repository = self._repository(OpenInterestRepository)
+        records = self._client(CoinglassAPI).get_aggregated_open_interest_history(
+            symbol=job.key,
+            interval=OPEN_INTEREST_INTERVAL,
+            start_time=_utc_timestamp(job.window_start),
+            end_time=_utc_timestamp(job.window_end),
+        )
+        if not records:
+            return 0
+        window = (
+            min(r.unix_timestamp for r in records),
+            max(r.unix_timestamp for r in records),
+        )
+        stored = {
+            row.unix_timestamp
+            for row in repository.where(
+                [("symbol", job.key), ("unix_timestamp", "between", window)],
+                columns=["unix_timestamp"],
+            )
+        }
+        records = [r for r in records if r.unix_timestamp not in stored]
+        return repository.bulk_create(records, isolate_errors=True)
+
+    def fetch_deribit(self, job: FetchJobTable) -> int:
+        # job windows are naive UTC, and so is the stored `datetime_` of the
+        # bucket, whatever the time zone of the worker host
+        repository = self._repository(DeribitFuturesRepository)
+        asset, future = job.key.split(":")
+        filters = [
+            ("asset", asset),
+            ("future_reference", future),
+            ("datetime_", job.window_start),
+        ]
+        if repository.max("unix_timestamp", filters) is not None:
+            return 0
+        api = self._client(DeribitAPI)
+        resolution = int((job.window_end - job.window_start).total_seconds() // 60)
+        # the client converts dates to timestamps in local time
+        date = datetime.fromtimestamp(_utc_timestamp(job.window_end))
+
+        async def fetch():
+            instruments = await api.get_historical_instruments(date=date, symbol=asset)
+            return await api.get_future_data_from_instrument_name(
+                date=date,
+                future=Future(future),
+                instrument_name=instruments[future][asset],
+                symbol=asset,
+                resolution=resolution,
+            )
+
+        try:
+            record = self._loop.run_until_complete(fetch())
+        except ValueError:
+            logger.info(f"No Deribit data for {job.key} at {job.window_start}")
+            return 0
+        record = record._replace(datetime_=job.window_start)
+        return repository.bulk_create([record], isolate_errors=True)
+
+    def fetch_coinmarketcap(self, job: FetchJobTable) -> int:
+        repository = self._repository(CoinMarketCapHistoryRepository)
+        date = job.window_start.date().isoformat()
+        if repository.max("utc", [("iso_date", date)]) is not None:
+            return 0
+        records = self._client(CoinMarketCapAPI).listing_historical(date=date)
+        return repository.bulk_create(records, isolate_errors=True)
+
+    def process(self, job: FetchJobTable) -> bool:
+        """Run a claimed job and settle it, returns whether it succeeded."""
+        handler = self._handlers[job.provider, job.endpoint]
+        try:
+            inserted = handler(job)
+        except Exception as exc:
+            for repository in self._repositories.values():
+                repository.rollback()
+            logger.exception(f"Job {job.id} {job.key} {job.window_start} failed")
+            self.jobs.fail(job, self.name, f"{type(exc).__name__}: {exc}")
+            return False
+        if not self.jobs.complete(job, self.name):
+            logger.warning(f"Lost the lease of job {job.id} before completing it")
+        logger.info(
+            f"Job {job.id} {job.provider} {job.key} {job.window_start}: "
+            f"inserted {inserted} rows"
+        )
+        return True
+
+    def run_once(self) -> int:
+        """Claim and process one batch, returns the number of claimed jobs."""
+        jobs = self.jobs.claim(self.name, self.batch_size, self.lease, self.provider)
+        for job in jobs:
+            # the earlier jobs of the batch used up part of the lease
+            if not self.jobs.extend(job, self.name, self.lease):
+                logger.warning(f"Lost the lease of job {job.id} before starting it")
+                continue
+            self.process(job)
+        return len(jobs)
+
+    def close(self):
+        """Close the Deribit client and the event loop of the worker."""
+        if DeribitAPI in self._clients:
+            self._loop.run_until_complete(self._clients[DeribitAPI].client.aclose())
+        self._loop.close()
+
+    def __enter__(self) -> "FetchWorker":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, idle_sleep: float = 30, stop_when_empty: bool = False):
+        """Process jobs until the queue is empty or forever."""
+        logger.info(f"Starting fetch worker {self.name}")
+        while True:
+            if self.run_once():
+                continue
+            if stop_when_empty:
+                logger.info(f"No jobs left, stopping worker {self.name}")
+                return
+            time.sleep(idle_sleep)
@@ -0,0 +1,266 @@
+"""Process wide metrics of the API clients and repositories.
+
+Counters and histograms are kept in memory and exposed in the Prometheus text
+format, either over HTTP with `serve` or as rows written to the `metrics`
+table with `write_snapshot`, so Grafana can chart request latency, rate limit
+waits, throughput and database time next to the data itself.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value: str) -> str:
+    """Escape backslashes and line feeds as the text exposition format requires."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = {k: _escape(v).replace('"', '\\"') for k, v in labels.items()}
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
+
+
+class _Metric:
+    type_: str
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Get the child metric of the given label values."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        values = tuple(str(v) for v in values)
+        with self._lock:
+            if values not in self._children:
+                self._children[values] = self._new_child()
+            return self._children[values]
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """Get all samples as (name, labels, value)."""
+        with self._lock:
+            children = list(self._children.items())
+        samples = []
+        for values, child in children:
+            labels = dict(zip(self.labelnames, values))
+            samples.extend(child.samples(self.name, labels))
+        return samples
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type_}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self, name: str, labels: dict):
+        return [(f"{name}_total", labels, self.value)]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type_ = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name: str, labels: dict):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        samples, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else str(bound)
+            samples.append((f"{name}_bucket", {**labels, "le": le}, cumulative))
+        samples.append((f"{name}_sum", labels, total))
+        samples.append((f"{name}_count", labels, cumulative))
+        return samples
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets per label set."""
+
+    type_ = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), **kw):
+        return self.register(Histogram(name, documentation, labelnames, **kw))
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        return [s for metric in self._metrics.values() for s in metric.samples()]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "arista_http_request_seconds",
+    "Latency of upstream API requests",
+    ("client", "endpoint"),
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "arista_http_requests",
+    "Upstream API requests by outcome",
+    ("client", "endpoint", "outcome"),
+)
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.counter(
+    "arista_rate_limit_wait_seconds",
+    "Time spent waiting to stay within upstream rate limits",
+    ("client",),
+)
+RETRIES = REGISTRY.counter(
+    "arista_retries",
+    "Retried requests and reconnects",
+    ("client",),
+)
+ROWS_FETCHED = REGISTRY.counter(
+    "arista_rows_fetched",
+    "Rows returned by upstream APIs",
+    ("client", "endpoint"),
+)
+FETCH_RESULTS = REGISTRY.counter(
+    "arista_fetch_results",
+    "Results of fetch attempts of the sync scripts",
+    ("client", "result"),
+)
+ROWS_WRITTEN = REGISTRY.counter(
+    "arista_rows_written",
+    "Rows written to the database",
+    ("table",),
+)
+DB_SECONDS = REGISTRY.histogram(
+    "arista_db_seconds",
+    "Duration of repository operations",
+    ("table", "operation"),
+)
+
+
+def wait(client: str, seconds: float):
+    """Sleep to respect a rate limit and record the wait."""
+    time.sleep(seconds)
+    RATE_LIMIT_WAIT_SECONDS.labels(client).inc(seconds)
+
+
+async def async_wait(client: str, seconds: float):
+    """Like `wait`, without blocking the event loop."""
+    await asyncio.sleep(seconds)
+    RATE_LIMIT_WAIT_SECONDS.labels(client).inc(seconds)
+
+
+def timed(func):
+    """Record the duration of a repository method per table and operation."""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        child = DB_SECONDS.labels(self._model.__tablename__, func.__name__)
+        with child.time():
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Expose the metrics for Prometheus on `http://host:port/metrics`."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Serving metrics on {host}:{port}")
+    return server
@@ -0,0 +1,3 @@
+from arista.mock.server import Faults, MockAPIServer, MockDeribitWebSocket
+
+__all__ = ["Faults", "MockAPIServer", "MockDeribitWebSocket"]
@@ -0,0 +1,187 @@
+"""Deterministic payloads in the format of the upstream APIs.
+
+Every value is derived from its symbol or instrument and timestamp only, so two
+runs against the mock servers see byte-identical responses.
+"""
+
+import math
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from arista.api.deribit import DeribitAPI
+
+SYMBOLS = ["BTC", "ETH", "SOL", "XRP", "BNB", "DOGE", "ADA", "AVAX", "LINK", "DOT"]
+LISTING_SIZE = 200
+BASE_PRICES = {"BTC": 60000.0, "ETH": 3000.0}
+INTERVAL_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+CMC_TIMESTAMP_FMT = "%Y-%m-%dT%H:%M:%S.000Z"
+
+
+def _noise(*key) -> float:
+    """Stable pseudo random number in [-1, 1] derived from `key`."""
+    return zlib.crc32(repr(key).encode()) / 0xFFFFFFFF * 2 - 1
+
+
+def price(symbol: str, unix_timestamp: int) -> float:
+    """Price of a symbol at a timestamp: a slow cycle plus stable noise."""
+    base = BASE_PRICES.get(symbol, 1 + abs(_noise(symbol)) * 100)
+    cycle = math.sin(unix_timestamp / (86400 * 30) + abs(_noise(symbol)) * math.pi)
+    return base * (1 + 0.2 * cycle + 0.01 * _noise(symbol, unix_timestamp))
+
+
+def interval_seconds(interval: str) -> int:
+    return int(interval[:-1]) * INTERVAL_SECONDS[interval[-1]]
+
+
+def coinglass_supported_coins() -> list[str]:
+    return list(SYMBOLS)
+
+
+def coinglass_open_interest(
+    symbol: str,
+    interval: str,
+    limit: int,
+    start_time: int = None,
+    end_time: int = None,
+    now: int = None,
+) -> list[dict]:
+    """Latest `limit` closed candles between `start_time` and `end_time`."""
+    step = interval_seconds(interval)
+    end = min(end_time or now, now)
+    end -= end % step
+    start = max(start_time or 0, end - (limit - 1) * step)
+    start += -start % step
+    candles = []
+    for t in range(start, end + 1, step):
+        close = price(symbol, t) * 1e4
+        candles.append(
+            {
+                "t": t,
+                "o": str(round(close * (1 + 0.01 * _noise(symbol, t, "o")))),
+                "h": str(round(close * 1.02)),
+                "l": str(round(close * 0.98)),
+                "c": str(round(close)),
+            }
+        )
+    return candles
+
+
+def cmc_listing(date: str = None, now: int = None) -> list[dict]:
+    """Listing of `LISTING_SIZE` coins at the end of `date`, or at `now`."""
+    if date:
+        updated = datetime.fromisoformat(date).replace(tzinfo=timezone.utc) + timedelta(
+            hours=23, minutes=55
+        )
+    else:
+        updated = datetime.fromtimestamp(now, timezone.utc)
+    unix_timestamp = int(updated.timestamp())
+    symbols = SYMBOLS + [f"C{i:03d}" for i in range(LISTING_SIZE - len(SYMBOLS))]
+    listing = []
+    for rank, symbol in enumerate(symbols, start=1):
+        p = price(symbol, unix_timestamp)
+        supply = 1e9 / rank
+        listing.append(
+            {
+                "id": zlib.crc32(symbol.encode()) % 100000,
+                "name": symbol.title(),
+                "symbol": symbol,
+                "cmc_rank": rank,
+                "circulating_supply": supply * 0.9,
+                "total_supply": supply,
+                "max_supply": None,
+                "last_updated": updated.strftime(CMC_TIMESTAMP_FMT),
+                "quote": {
+                    "USD": {
+                        "price": p,
+                        "volume_24h": p * supply * 0.05,
+                        "volume_change_24h": _noise(symbol, unix_timestamp, "v"),
+                        "market_cap": p * supply * 0.9,
+                        "fully_diluted_market_cap": p * supply,
+                    }
+                },
+            }
+        )
+    return listing
+
+
+def deribit_instrument(name: str, expiration: datetime | None, period: str) -> dict:
+    expiration_timestamp = (
+        int(expiration.replace(hour=8).timestamp() * 1000)
+        if expiration
+        else 32503708800000
+    )
+    return {
+        "instrument_name": name,
+        "kind": "future",
+        "base_currency": name.split("-")[0],
+        "settlement_period": period,
+        "expiration_timestamp": expiration_timestamp,
+        "is_active": True,
+    }
+
+
+def deribit_instruments(currency: str, expired: bool, now: int) -> list[dict]:
+    """Live futures of a currency, or the weeklies of the past twelve weeks."""
+    api = DeribitAPI.__new__(DeribitAPI)
+    day = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0)
+    if expired:
+        instruments = []
+        for weeks in range(1, 13):
+            dates = api.compute_initial_expiration_dates(day - timedelta(weeks=weeks))
+            expiration = dates["current_week"]
+            if expiration < day:
+                name = api.format_instrument_names(dates, [currency])["current_week"]
+                instruments.append(
+                    deribit_instrument(name[currency], expiration, "week")
+                )
+        return instruments
+
+    dates = api.roll_over_expiration_dates(
+        api.compute_initial_expiration_dates(day), day
+    )
+    names = api.format_instrument_names(dates, [currency])
+    periods = {"current_week": "week", "next_week": "week", "current_month": "month"}
+    instruments = {}
+    for future, date in dates.items():
+        name = names[future][currency]
+        instruments[name] = deribit_instrument(name, date, periods.get(future, "month"))
+    perpetual = f"{currency}-PERPETUAL"
+    instruments[perpetual] = deribit_instrument(perpetual, None, "perpetual")
+    return list(instruments.values())
+
+
+def deribit_chart(
+    instrument_name: str, start_ms: int, end_ms: int, resolution: int
+) -> dict:
+    """TradingView chart data between two timestamps in milliseconds."""
+    step = resolution * 60
+    start = start_ms // 1000
+    start += -start % step
+    ticks = list(range(start, end_ms // 1000 + 1, step))
+    if not ticks:
+        return {"status": "no_data"}
+    asset = instrument_name.split("-")[0]
+    close = [price(asset, t) * (1 + 0.001 * _noise(instrument_name)) for t in ticks]
+    return {
+        "status": "ok",
+        "ticks": [t * 1000 for t in ticks],
+        "open": close,
+        "high": [c * 1.01 for c in close],
+        "low": [c * 0.99 for c in close],
+        "close": close,
+        "volume": [abs(_noise(instrument_name, t)) * 100 for t in ticks],
+        "cost": [abs(_noise(instrument_name, t)) * 1e6 for t in ticks],
+    }
+
+
+def deribit_ticker(instrument_name: str, timestamp_ms: int) -> dict:
+    """Ticker notification data of an instrument."""
+    asset = instrument_name.split("-")[0]
+    last = price(asset, timestamp_ms // 1000) * (1 + 0.001 * _noise(instrument_name))
+    return {
+        "instrument_name": instrument_name,
+        "timestamp": timestamp_ms,
+        "last_price": last,
+        "mark_price": last,
+        "index_price": price(asset, timestamp_ms // 1000),
+    }
@@ -0,0 +1,341 @@
+"""Local stand-in servers for the Coinglass, CoinMarketCap and Deribit APIs.
+
+A single HTTP server answers all three REST APIs under a path prefix per API,
+and a WebSocket server pushes Deribit ticker notifications. Both add
+configurable latency and can inject rate limit responses and server errors, so
+fetchers can be exercised and benchmarked offline without API keys.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import parse_qsl, urlparse
+
+import websockets
+
+from arista.mock import fixtures
+
+logger = logging.getLogger(__name__)
+
+COINGLASS = "/coinglass/api"
+COINMARKETCAP = "/coinmarketcap/v1/cryptocurrency"
+DERIBIT = "/deribit/api/v2/public"
+
+
+class Faults(NamedTuple):
+    """Latency and failures added by the mock servers."""
+
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # maximum random seconds added on top of `latency`
+    rate_limit: int | None = None  # requests per minute per API
+    error_rate: float = 0.0  # share of requests answered with a server error
+    seed: int = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"  # keep connections alive like the real APIs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        status, payload = self.server.mock.handle(url.path, params)
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    mock: "MockAPIServer"
+
+
+class MockAPIServer:
+    """HTTP stand-in for the Coinglass, CoinMarketCap and Deribit REST APIs.
+
+    Recorded payloads take precedence over generated ones: a file
+    `<recorded>/<api>/<endpoint>.json`, e.g. `coinglass/futures_supported-coins.json`,
+    is replayed verbatim for every request to that endpoint.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Faults = Faults(),
+        recorded: str | Path = None,
+        now: int = None,
+    ):
+        """Instantiate MockAPIServer.
+
+        Args:
+            host (str): Interface to bind to.
+            port (int): Port to bind to, 0 picks a free port.
+            faults (Faults): Latency and failures to add.
+            recorded (str | Path, optional): Directory of recorded payloads.
+            now (int, optional): Fixed current unix timestamp for reproducible
+                responses. Defaults to the wall clock.
+        """
+        self.faults = faults
+        self.recorded = Path(recorded) if recorded else None
+        self.now = now
+        self.requests: Counter = Counter()
+        self._random = random.Random(faults.seed)
+        self._lock = threading.Lock()
+        self._windows: dict[str, deque] = {}
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.mock = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict[str, str]:
+        """Environment variables pointing the clients at this server."""
+        return {
+            "COINGLASS_API_URL": self.url + COINGLASS,
+            "COINMARKETCAP_API_URL": self.url + COINMARKETCAP,
+            "DERIBIT_API_URL": self.url + DERIBIT,
+        }
+
+    def start(self) -> "MockAPIServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Mock API server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _now(self) -> int:
+        return self.now or int(time.time())
+
+    def _rate_limited(self, api: str) -> bool:
+        if self.faults.rate_limit is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(api, deque())
+            while window and window[0] <= now - 60:
+                window.popleft()
+            if len(window) >= self.faults.rate_limit:
+                return True
+            window.append(now)
+        return False
+
+    def _delay_and_fail(self) -> bool:
+        """Sleep for the configured latency, return whether to inject an error."""
+        with self._lock:
+            jitter = self._random.uniform(0, self.faults.jitter)
+            fail = self._random.random() < self.faults.error_rate
+        if self.faults.latency or jitter:
+            time.sleep(self.faults.latency + jitter)
+        return fail
+
+    def _replay(self, api: str, endpoint: str):
+        if self.recorded is None:
+            return None
+        path = self.recorded / api / f"{endpoint.strip('/').replace('/', '_')}.json"
+        if path.exists():
+            return json.loads(path.read_text())
+        return None
+
+    def handle(self, path: str, params: dict) -> tuple[int, dict]:
+        """Answer a request with its status code and JSON payload."""
+        for api, prefix, handler in [
+            ("coinglass", COINGLASS, self._coinglass),
+            ("coinmarketcap", COINMARKETCAP, self._coinmarketcap),
+            ("deribit", DERIBIT, self._deribit),
+        ]:
+            if path.startswith(prefix):
+                self.requests[api] += 1
+                fail = self._delay_and_fail()
+                return handler(path[len(prefix) :], params, fail)
+        return 404, {"error": f"Unknown path {path}"}
+
+    def _coinglass(self, endpoint: str, params: dict, fail: bool):
+        if fail:
+            return 500, {"code": "500", "msg": "Internal Server Error"}
+        if self._rate_limited("coinglass"):
+            return 200, {"code": "50001", "msg": "50001", "data": None}
+        if (data := self._replay("coinglass", endpoint)) is not None:
+            return 200, data
+        if endpoint == "/futures/supported-coins":
+            data = fixtures.coinglass_supported_coins()
+        elif endpoint == "/futures/openInterest/ohlc-aggregated-history":
+            data = fixtures.coinglass_open_interest(
+                symbol=params["symbol"],
+                interval=params["interval"],
+                limit=int(params.get("limit", 4500)),
+                start_time=int(params["startTime"]) if "startTime" in params else None,
+                end_time=int(params["endTime"]) if "endTime" in params else None,
+                now=self._now(),
+            )
+        else:
+            return 404, {"code": "404", "msg": f"Unknown endpoint {endpoint}"}
+        return 200, {"code": "0", "msg": "success", "data": data}
+
+    def _coinmarketcap(self, endpoint: str, params: dict, fail: bool):
+        if fail:
+            return 500, {"status": {"error_code": 500, "error_message": "Error"}}
+        if self._rate_limited("coinmarketcap"):
+            status = {"error_code": 1008, "error_message": "Rate limit reached"}
+            return 429, {"status": status}
+        if (data := self._replay("coinmarketcap", endpoint)) is not None:
+            return 200, data
+        if endpoint == "/listings/latest":
+            data = fixtures.cmc_listing(now=self._now())
+        elif endpoint == "/listings/historical":
+            data = fixtures.cmc_listing(date=params["date"])
+        else:
+            return 404, {"status": {"error_code": 404, "error_message": endpoint}}
+        return 200, {"status": {"error_code": 0}, "data": data}
+
+    def _deribit(self, endpoint: str, params: dict, fail: bool):
+        now = self._now()
+        envelope = {"jsonrpc": "2.0", "usIn": now * 10**6, "usOut": now * 10**6}
+        if fail:
+            error = {"code": 11094, "message": "internal_server_error"}
+            return 500, {**envelope, "error": error}
+        if self._rate_limited("deribit"):
+            error = {"code": 10028, "message": "too_many_requests"}
+            return 429, {**envelope, "error": error}
+        if (data := self._replay("deribit", endpoint)) is not None:
+            return 200, data
+        if endpoint == "/get_instruments":
+            result = fixtures.deribit_instruments(
+                params["currency"], params.get("expired") == "true", now
+            )
+        elif endpoint == "/get_instrument":
+            name = params["instrument_name"]
+            result = fixtures.deribit_instrument(name, None, "perpetual")
+        elif endpoint == "/get_tradingview_chart_data":
+            end_ms = int(params["end_timestamp"])
+            envelope["usOut"] = end_ms * 1000
+            result = fixtures.deribit_chart(
+                params["instrument_name"],
+                int(params["start_timestamp"]),
+                end_ms,
+                int(params["resolution"]),
+            )
+        else:
+            error = {"code": -32601, "message": "Method not found"}
+            return 400, {**envelope, "error": error}
+        return 200, {**envelope, "result": result}
+
+
+class MockDeribitWebSocket:
+    """WebSocket stand-in pushing Deribit ticker notifications."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        tick_interval: float = 0.1,
+        faults: Faults = Faults(),
+    ):
+        """Instantiate MockDeribitWebSocket.
+
+        Args:
+            host (str): Interface to bind to.
+            port (int): Port to bind to, 0 picks a free port.
+            tick_interval (float): Seconds between two tickers of a channel.
+            faults (Faults): Latency added before every push; `error_rate` is
+                the share of pushes that close the connection instead.
+        """
+        self.host = host
+        self.port = port
+        self.tick_interval = tick_interval
+        self.faults = faults
+        self.notifications = 0
+        self._random = random.Random(faults.seed)
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> "MockDeribitWebSocket":
+        self._server = await websockets.serve(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock Deribit WebSocket listening on {self.url}")
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _connection(self, ws):
+        channels: set[str] = set()
+        pusher = asyncio.create_task(self._push(ws, channels))
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                result = "ok"
+                if message.get("method") == "public/subscribe":
+                    channels.update(message["params"]["channels"])
+                    result = message["params"]["channels"]
+                await ws.send(
+                    json.dumps(
+                        {"jsonrpc": "2.0", "id": message.get("id"), "result": result}
+                    )
+                )
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            pusher.cancel()
+
+    async def _push(self, ws, channels: set[str]):
+        while True:
+            await asyncio.sleep(
+                self.tick_interval
+                + self.faults.latency
+                + self._random.uniform(0, self.faults.jitter)
+            )
+            if self._random.random() < self.faults.error_rate:
+                await ws.close(code=1011, reason="injected error")
+                return
+            timestamp_ms = int(time.time() * 1000)
+            for channel in list(channels):
+                instrument_name = channel.split(".")[1]
+                message = {
+                    "jsonrpc": "2.0",
+                    "method": "subscription",
+                    "params": {
+                        "channel": channel,
+                        "data": fixtures.deribit_ticker(instrument_name, timestamp_ms),
+                    },
+                }
+                await ws.send(json.dumps(message))
+                self.notifications += 1
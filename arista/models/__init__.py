@@ -1,11 +1,23 @@
 from .coinmarketcap import CoinMarketCapHistoryRepository
+from .constant_maturity import ConstantMaturityBasisRepository
+from .dead_letter import DeadLetterRepository
 from .deribit import DeribitFuturesRepository
+from .fetch_job import FetchJobRepository
 from .funding_rate import FundingRateRepository
+from .metric import MetricSampleRepository
 from .open_interest import OpenInterestRepository
+from .rate_limit import RateLimitRepository
+from .signal import SignalRepository
 
 __all__ = [
     CoinMarketCapHistoryRepository,
     OpenInterestRepository,
     FundingRateRepository,
     DeribitFuturesRepository,
+    ConstantMaturityBasisRepository,
+    SignalRepository,
+    MetricSampleRepository,
+    FetchJobRepository,
+    RateLimitRepository,
+    DeadLetterRepository,
 ]
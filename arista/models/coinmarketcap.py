@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import NamedTuple
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 from arista.db.repositories import BaseRepository
 
@@ -32,10 +33,34 @@ class CoinMarketCapHistory(SQLModel):
     iso_date: str = Field(description="ISO time", default=None)
 
 
+class CoinMarketCapHistoryRecord(NamedTuple):
+    """Slotted ingestion row for the Coinmarketcap history table."""
+
+    cmc_rank: int
+    cmc_id: int
+    name: str
+    symbol: str
+    market_cap_by_total_supply: float
+    circulating_supply: float
+    total_supply: float
+    price: float
+    volume_24h: float
+    market_cap: float
+    utc: datetime
+    iso_date: str
+    max_supply: float | None = None
+    volume_change_24h: float | None = None
+    fully_diluted_market_cap: float | None = None
+
+
 class CoinMarketCapHistoryTable(CoinMarketCapHistory, table=True):
     """Database model for Coinmarketcap history."""
 
     __tablename__ = "coinmarketcap"
+    __table_args__ = (
+        Index("ix_coinmarketcap_utc_id", "utc", "id"),
+        Index("ix_coinmarketcap_symbol_utc", "symbol", "utc"),
+    )
 
     id: int = Field(default=None, primary_key=True)
 
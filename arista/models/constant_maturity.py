@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlmodel import Field, SQLModel, UniqueConstraint
+
+from arista.db.repositories import BaseRepository
+
+
+class ConstantMaturityBasis(SQLModel):
+    """Model for constant maturity annualised basis of Deribit futures."""
+
+    asset: str = Field(description="BTC or ETH")
+    tenor: int = Field(description="Constant maturity in days")
+    datetime_: datetime = Field(description="Datetime of the futures snapshot")
+    basis: float = Field(description="Interpolated annualised basis")
+
+
+class ConstantMaturityBasisRecord(NamedTuple):
+    """Slotted ingestion row for the constant maturity basis table."""
+
+    asset: str
+    tenor: int
+    datetime_: datetime
+    basis: float
+
+
+class ConstantMaturityBasisTable(ConstantMaturityBasis, table=True):
+    """Database model for constant maturity basis."""
+
+    __tablename__ = "constant_maturity_basis"
+    __table_args__ = (
+        UniqueConstraint(
+            "asset", "tenor", "datetime_", name="cm_asset_tenor_time_unique_constraint"
+        ),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+
+
+class ConstantMaturityBasisRepository(BaseRepository[ConstantMaturityBasisTable]):
+    """Repository to interact with constant maturity basis table."""
+
+    _model = ConstantMaturityBasisTable
+    timestamp_col = "datetime_"
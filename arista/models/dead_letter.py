@@ -0,0 +1,51 @@
+import json
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlmodel import Field, SQLModel
+
+from arista.db.repositories import BaseRepository
+
+
+class DeadLetter(SQLModel):
+    """Model for rows rejected by a bulk write."""
+
+    table_name: str = Field(description="Table the row was written to")
+    payload: str = Field(description="JSON encoded row")
+    error: str = Field(description="Database error of the row")
+    utc: datetime = Field(description="UTC time of the rejection")
+
+
+class DeadLetterRecord(NamedTuple):
+    """Slotted ingestion row for the dead letters table."""
+
+    table_name: str
+    payload: str
+    error: str
+    utc: datetime
+
+
+class DeadLetterTable(DeadLetter, table=True):
+    """Database model for dead letters."""
+
+    __tablename__ = "dead_letters"
+
+    id: int = Field(default=None, primary_key=True)
+
+
+class DeadLetterRepository(BaseRepository[DeadLetterTable]):
+    """Repository to interact with dead letters table."""
+
+    _model = DeadLetterTable
+    timestamp_col = "utc"
+
+    @staticmethod
+    def to_records(
+        table_name: str, rejected: list[tuple[dict, str]]
+    ) -> list[DeadLetterRecord]:
+        """Convert rejected `(row, error)` pairs into dead letter records."""
+        utc = datetime.utcnow()
+        return [
+            DeadLetterRecord(table_name, json.dumps(row, default=str), error, utc)
+            for row, error in rejected
+        ]
@@ -1,11 +1,17 @@
 from datetime import datetime
+from typing import NamedTuple
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 from arista.db.repositories import BaseRepository
 
 
 class DeribitFuture(SQLModel):
+    """Model for Deribit future prices, the columns of the table.
+
+    The API client builds `DeribitFutureRecord` rows rather than instances.
+    """
+
     asset: str = Field(description="BTC or ETH")
     instrument: str = Field(description="Deribit instrument name")
     future_reference: str = Field(description="future type")
@@ -19,10 +25,35 @@ class DeribitFuture(SQLModel):
     size: float | None = Field(description="Size of the future contract", default=None)
 
 
+class DeribitFutureRecord(NamedTuple):
+    """Slotted ingestion row for the Deribit futures table.
+
+    This is the canonical record returned by `DeribitAPI`, its fields mirror
+    the columns of `DeribitFuture` one to one so batches convert directly
+    into insert parameters."""
+
+    asset: str
+    instrument: str
+    future_reference: str
+    expiration: str | None
+    price: float
+    unix_timestamp: int
+    datetime_: datetime
+    size: float | None = None
+
+
 class DeribitFuturesTable(DeribitFuture, table=True):
     """Database model for Deribit Futures."""
 
     __tablename__ = "deribit_futures"
+    __table_args__ = (
+        Index("ix_deribit_futures_unix_timestamp_id", "unix_timestamp", "id"),
+        Index(
+            "ix_deribit_futures_instrument_unix_timestamp",
+            "instrument",
+            "unix_timestamp",
+        ),
+    )
 
     id: int = Field(default=None, primary_key=True)
 
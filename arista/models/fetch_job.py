@@ -0,0 +1,215 @@
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlmodel import Field, Index, SQLModel, UniqueConstraint
+
+from arista.db.repositories import BaseRepository
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class FetchJob(SQLModel):
+    """Model for a unit of fetch work shared by all workers."""
+
+    provider: str = Field(description="Upstream API, e.g. coinglass")
+    endpoint: str = Field(description="Endpoint or dataset of the provider")
+    key: str = Field(description="Series key, e.g. BTC or BTC:quarter_1")
+    window_start: datetime = Field(description="Start of the window to fetch")
+    window_end: datetime = Field(description="End of the window to fetch")
+    status: str = Field(description="pending, running, done or failed", default=PENDING)
+    attempts: int = Field(description="Number of claims so far", default=0)
+    max_attempts: int = Field(description="Claims before giving up", default=5)
+    lease_expires_at: datetime | None = Field(
+        description="A running job is reclaimed after its lease expired", default=None
+    )
+    worker: str | None = Field(description="Worker holding the lease", default=None)
+    error: str | None = Field(description="Error of the last attempt", default=None)
+    updated_at: datetime | None = Field(description="Last status change", default=None)
+
+
+class FetchJobRecord(NamedTuple):
+    """Slotted ingestion row for the fetch jobs table."""
+
+    provider: str
+    endpoint: str
+    key: str
+    window_start: datetime
+    window_end: datetime
+    status: str = PENDING
+    attempts: int = 0
+    max_attempts: int = 5
+
+
+class FetchJobTable(FetchJob, table=True):
+    """Database model for fetch jobs."""
+
+    __tablename__ = "fetch_jobs"
+    __table_args__ = (
+        UniqueConstraint(
+            "provider",
+            "endpoint",
+            "key",
+            "window_start",
+            "window_end",
+            name="fetch_job_unique_constraint",
+        ),
+        Index("ix_fetch_jobs_status_window_start", "status", "window_start"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+
+
+class FetchJobRepository(BaseRepository[FetchJobTable]):
+    """Repository to enqueue, claim and settle fetch jobs.
+
+    Jobs are claimed with `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of
+    workers can poll the table concurrently without handing out a job twice.
+    Timestamps are naive UTC of the worker clocks, like the rest of the tables.
+    """
+
+    _model = FetchJobTable
+    timestamp_col = "window_start"
+
+    def enqueue(self, jobs: list[FetchJobRecord]) -> int:
+        """Insert jobs, skipping jobs that already exist in any status.
+
+        Args:
+            jobs (list[FetchJobRecord]): Jobs to insert.
+
+        Returns:
+            int: The number of new jobs.
+        """
+        if not jobs:
+            return 0
+        if self._session.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.utcnow()
+        params = [{**job._asdict(), "updated_at": now} for job in jobs]
+        stmt = insert(self._model.__table__).on_conflict_do_nothing()
+        result = self._session.execute(stmt, params)
+        self._session.commit()
+        return max(result.rowcount, 0)
+
+    def claim(
+        self,
+        worker: str,
+        n: int = 1,
+        lease: timedelta = timedelta(minutes=10),
+        provider: str = None,
+    ) -> list[FetchJobTable]:
+        """Lease up to `n` pending jobs, or running jobs whose lease expired.
+
+        Expired jobs without attempts left are marked failed first, a worker
+        crashed on their final attempt.
+
+        Args:
+            worker (str): Name of the claiming worker.
+            n (int): Maximum number of jobs to claim.
+            lease (timedelta): Time until the jobs can be reclaimed by others.
+            provider (str, optional): Only claim jobs of this provider.
+
+        Returns:
+            list[FetchJobTable]: The claimed jobs, oldest window first.
+        """
+        table = self._model.__table__
+        now = datetime.utcnow()
+        self._fail_expired(now)
+        conditions = [
+            or_(
+                table.c.status == PENDING,
+                and_(table.c.status == RUNNING, table.c.lease_expires_at < now),
+            ),
+            table.c.attempts < table.c.max_attempts,
+        ]
+        if provider is not None:
+            conditions.append(table.c.provider == provider)
+        claimable = (
+            select(table.c.id)
+            .where(and_(*conditions))
+            .order_by(table.c.window_start)
+            .limit(n)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(table)
+            .where(table.c.id.in_(claimable.scalar_subquery()))
+            .values(
+                status=RUNNING,
+                attempts=table.c.attempts + 1,
+                worker=worker,
+                lease_expires_at=now + lease,
+                updated_at=now,
+            )
+            .returning(*table.c)
+        )
+        rows = self._session.execute(stmt).all()
+        self._session.commit()
+        jobs = [self._model(**row._mapping) for row in rows]
+        return sorted(jobs, key=lambda job: job.window_start)
+
+    def _fail_expired(self, now: datetime):
+        """Fail running jobs whose lease expired on their final attempt."""
+        table = self._model.__table__
+        stmt = (
+            update(table)
+            .where(
+                and_(
+                    table.c.status == RUNNING,
+                    table.c.lease_expires_at < now,
+                    table.c.attempts >= table.c.max_attempts,
+                )
+            )
+            .values(
+                status=FAILED,
+                lease_expires_at=None,
+                error="Lease expired on the final attempt",
+                updated_at=now,
+            )
+        )
+        self._session.execute(stmt)
+
+    def _settle(self, job: FetchJobTable, worker: str, **values) -> bool:
+        """Update a job only if `worker` still holds its lease."""
+        table = self._model.__table__
+        stmt = (
+            update(table)
+            .where(
+                and_(
+                    table.c.id == job.id,
+                    table.c.worker == worker,
+                    table.c.status == RUNNING,
+                )
+            )
+            .values(updated_at=datetime.utcnow(), **values)
+        )
+        result = self._session.execute(stmt)
+        self._session.commit()
+        return result.rowcount == 1
+
+    def complete(self, job: FetchJobTable, worker: str) -> bool:
+        """Mark a job done, returns False if the lease was lost in the meantime."""
+        return self._settle(job, worker, status=DONE, lease_expires_at=None, error=None)
+
+    def fail(self, job: FetchJobTable, worker: str, error: str) -> bool:
+        """Release a failed job for a retry, or fail it after `max_attempts`."""
+        status = FAILED if job.attempts >= job.max_attempts else PENDING
+        return self._settle(
+            job, worker, status=status, lease_expires_at=None, error=error[:1000]
+        )
+
+    def extend(self, job: FetchJobTable, worker: str, lease: timedelta) -> bool:
+        """Extend the lease of a long running job."""
+        expires_at = datetime.utcnow() + lease
+        return self._settle(job, worker, lease_expires_at=expires_at)
+
+    def counts(self) -> dict[str, int]:
+        """Count the jobs per status."""
+        table = self._model.__table__
+        stmt = select(table.c.status, func.count()).group_by(table.c.status)
+        return dict(self._session.execute(stmt).all())
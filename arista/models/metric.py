@@ -0,0 +1,69 @@
+import json
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlmodel import Field, SQLModel
+
+from arista.db.repositories import BaseRepository
+from arista.metrics import REGISTRY, Registry
+
+
+class MetricSample(SQLModel):
+    """Model for snapshots of the process metrics."""
+
+    name: str = Field(description="Metric name, e.g. arista_rows_written_total")
+    labels: str = Field(description="JSON encoded labels")
+    value: float = Field(description="Value at the time of the snapshot")
+    process: str = Field(description="Process that reported the metric")
+    utc: datetime = Field(description="UTC time of the snapshot")
+
+
+class MetricSampleRecord(NamedTuple):
+    """Slotted ingestion row for the metrics table."""
+
+    name: str
+    labels: str
+    value: float
+    process: str
+    utc: datetime
+
+
+class MetricSampleTable(MetricSample, table=True):
+    """Database model for metric snapshots."""
+
+    __tablename__ = "metrics"
+
+    id: int = Field(default=None, primary_key=True)
+
+
+class MetricSampleRepository(BaseRepository[MetricSampleTable]):
+    """Repository to interact with metrics table."""
+
+    _model = MetricSampleTable
+    timestamp_col = "utc"
+
+    def write_snapshot(self, process: str, registry: Registry = REGISTRY) -> int:
+        """Write the current value of every counter and histogram sum and count.
+
+        Histogram buckets are left out to keep the table small, latency
+        averages and rates can be charted from `_sum` and `_count`.
+
+        Args:
+            process (str): Name of the reporting process, e.g. scheduler.
+            registry (Registry): Registry to snapshot.
+
+        Returns:
+            int: The number of samples written.
+        """
+        utc = datetime.utcnow()
+        records = [
+            MetricSampleRecord(name, json.dumps(labels), value, process, utc)
+            for name, labels, value in registry.samples()
+            if not name.endswith("_bucket")
+        ]
+        self.bulk_create(records)
+        return len(records)
+
+    def prune(self, retention: timedelta) -> int:
+        """Delete samples older than `retention`, returns the number of rows deleted."""
+        return self.delete_range(end=datetime.utcnow() - retention)
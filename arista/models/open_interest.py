@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import NamedTuple
 
-from sqlmodel import Field, SQLModel, UniqueConstraint
+from sqlmodel import Field, Index, SQLModel, UniqueConstraint
 
 from arista.db.repositories import BaseRepository
 
@@ -22,6 +23,16 @@ class OpenInterest(SQLModel):
         return datetime.utcfromtimestamp(unix_time)
 
 
+class OpenInterestRecord(NamedTuple):
+    """Slotted ingestion row for the open interest table."""
+
+    symbol: str
+    aggregated_open_interest: float
+    unix_timestamp: int
+    utc: datetime
+    source: str = "coinglass"
+
+
 class OpenInterestTable(OpenInterest, table=True):
     """Database model for aggregated open interest of Coinglass API."""
 
@@ -30,6 +41,7 @@ class OpenInterestTable(OpenInterest, table=True):
         UniqueConstraint(
             "symbol", "unix_timestamp", "utc", name="oi_symbol_time_unique_constraint"
         ),
+        Index("ix_open_interest_unix_timestamp_id", "unix_timestamp", "id"),
     )
 
     id: int = Field(default=None, primary_key=True)
@@ -0,0 +1,107 @@
+import time
+from typing import NamedTuple
+
+from sqlalchemy import select, text, update
+from sqlmodel import Field, SQLModel, UniqueConstraint
+
+from arista.db.repositories import BaseRepository
+
+
+class RateLimit(SQLModel):
+    """Model for a token bucket shared by all processes."""
+
+    name: str = Field(description="Bucket name, usually the provider")
+    tokens: float = Field(description="Tokens left at `updated_at`")
+    updated_at: float = Field(description="Unix time of the last refill")
+
+
+class RateLimitRecord(NamedTuple):
+    """Slotted ingestion row for the rate limits table."""
+
+    name: str
+    tokens: float
+    updated_at: float
+
+
+class RateLimitTable(RateLimit, table=True):
+    """Database model for shared token buckets."""
+
+    __tablename__ = "rate_limits"
+    __table_args__ = (
+        UniqueConstraint("name", name="rate_limit_name_unique_constraint"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+
+
+class RateLimitRepository(BaseRepository[RateLimitTable]):
+    """Repository to take tokens from the shared token buckets.
+
+    The bucket row is locked with `SELECT ... FOR UPDATE` while it is refilled
+    and decremented, so concurrent processes on any host draw from the same
+    budget. On Postgres the database clock is used, which keeps the refill
+    independent of clock skew between hosts.
+    """
+
+    _model = RateLimitTable
+    timestamp_col = "updated_at"
+
+    def _now(self) -> float:
+        if self._session.get_bind().dialect.name == "postgresql":
+            stmt = text("SELECT extract(epoch FROM clock_timestamp())")
+            return float(self._session.execute(stmt).scalar_one())
+        return time.time()
+
+    def _insert_if_missing(self, name: str, capacity: float):
+        if self._session.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        record = RateLimitRecord(name=name, tokens=capacity, updated_at=self._now())
+        stmt = insert(self._model.__table__).on_conflict_do_nothing()
+        self._session.execute(stmt, [record._asdict()])
+        self._session.commit()
+
+    def _lock_row(self, name: str, stmt):
+        if self._session.get_bind().dialect.name != "postgresql":
+            # SQLite has no row locks, take the database write lock instead
+            table = self._model.__table__
+            touch = update(table).where(table.c.name == name).values(name=name)
+            self._session.execute(touch)
+        return self._session.execute(stmt.with_for_update()).first()
+
+    def take(self, name: str, rate: float, capacity: float, tokens: float = 1) -> float:
+        """Take tokens from a bucket if available.
+
+        Args:
+            name (str): Name of the bucket, created full on first use.
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens, i.e. the allowed burst.
+            tokens (float): Tokens to take.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds to wait
+                until enough tokens are available.
+        """
+        table = self._model.__table__
+        stmt = select(table.c.tokens, table.c.updated_at).where(table.c.name == name)
+        row = self._lock_row(name, stmt)
+        if row is None:
+            self._session.rollback()
+            self._insert_if_missing(name, capacity)
+            row = self._lock_row(name, stmt)
+
+        now = self._now()
+        available = min(capacity, row.tokens + max(now - row.updated_at, 0) * rate)
+        if available >= tokens:
+            available -= tokens
+            wait = 0.0
+        else:
+            wait = (tokens - available) / rate
+        self._session.execute(
+            update(table)
+            .where(table.c.name == name)
+            .values(tokens=available, updated_at=now)
+        )
+        self._session.commit()
+        return wait
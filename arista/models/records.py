@@ -0,0 +1,68 @@
+"""Lightweight record types for the ingestion hot path.
+
+API clients build plain `NamedTuple` rows instead of SQLModel instances, which
+keeps per-row CPU and memory low during large syncs. Rows are validated and
+coerced once per batch with a cached pydantic `TypeAdapter`.
+"""
+
+from functools import lru_cache
+from typing import TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+
+Record = TypeVar("Record", bound=tuple)
+
+
+@lru_cache
+def _batch_adapter(record_type: type[Record]) -> TypeAdapter:
+    """Get a cached adapter validating a list of records."""
+    return TypeAdapter(list[record_type])
+
+
+def validate_batch(record_type: type[Record], rows: list[tuple]) -> list[Record]:
+    """Validate and coerce a batch of rows into records in a single pass.
+
+    Args:
+        record_type (type[Record]): The `NamedTuple` record type.
+        rows (list[tuple]): Raw tuples or records to validate.
+
+    Returns:
+        list[Record]: The validated records.
+    """
+    return _batch_adapter(record_type).validate_python(rows)
+
+
+@lru_cache
+def _record_adapter(record_type: type[Record]) -> TypeAdapter:
+    """Get a cached adapter validating a single record."""
+    return TypeAdapter(record_type)
+
+
+def partition_valid(
+    record_type: type[Record], rows: list[tuple]
+) -> tuple[list[Record], list[tuple[dict, str]]]:
+    """Validate a batch, separating the rows that fail validation.
+
+    The batch is validated in a single pass, and only row by row if it
+    contains invalid rows.
+
+    Args:
+        record_type (type[Record]): The `NamedTuple` record type.
+        rows (list[tuple]): Raw tuples or records to validate.
+
+    Returns:
+        tuple[list[Record], list[tuple[dict, str]]]: The valid records, and
+            the invalid rows as `(row, error)` pairs.
+    """
+    try:
+        return validate_batch(record_type, rows), []
+    except ValidationError:
+        pass
+    adapter = _record_adapter(record_type)
+    valid, invalid = [], []
+    for row in rows:
+        try:
+            valid.append(adapter.validate_python(row))
+        except ValidationError as exc:
+            invalid.append((dict(zip(record_type._fields, row)), str(exc)))
+    return valid, invalid
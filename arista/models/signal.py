@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlmodel import Field, SQLModel, UniqueConstraint
+
+from arista.db.repositories import BaseRepository
+
+
+class Signal(SQLModel):
+    """Model for signals computed from open interest and funding rates."""
+
+    source: str = Field(description="Source table of the signal, e.g. open_interest")
+    symbol: str = Field(description="Symbol")
+    name: str = Field(description="Signal name, e.g. zscore_60")
+    value: float = Field(description="Signal value")
+    unix_timestamp: int = Field(description="Unix timestamp time in seconds")
+    utc: datetime = Field(description="UTC time")
+
+
+class SignalRecord(NamedTuple):
+    """Slotted ingestion row for the signals table."""
+
+    source: str
+    symbol: str
+    name: str
+    value: float
+    unix_timestamp: int
+    utc: datetime
+
+
+class SignalTable(Signal, table=True):
+    """Database model for signals."""
+
+    __tablename__ = "signals"
+    __table_args__ = (
+        UniqueConstraint(
+            "source",
+            "symbol",
+            "name",
+            "unix_timestamp",
+            name="signal_source_symbol_name_time_unique_constraint",
+        ),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+
+
+class SignalRepository(BaseRepository[SignalTable]):
+    """Repository to interact with signals table."""
+
+    _model = SignalTable
+    timestamp_col = "unix_timestamp"
@@ -0,0 +1,145 @@
+"""Asyncio scheduler hosting all collectors in one long-running process.
+
+Jobs run on cron-like intervals aligned to the epoch (plus an offset), so a
+job with a 12h interval and 10 minute offset runs at 00:10 and 12:10. A job is
+never run concurrently with itself, and ticks missed while the process was busy
+or suspended are caught up in order.
+
+With a `leader`, e.g. an `arista.coordination.LeaderLock`, several scheduler
+processes can run as hot standbys: only the elected leader runs the jobs, and
+a standby takes over at its next tick once the leader is gone.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Protocol
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class Leader(Protocol):
+    def is_leader(self) -> bool: ...
+
+
+class Job:
+    """A named coroutine function run on every tick of an interval."""
+
+    def __init__(
+        self,
+        name: str,
+        interval: timedelta,
+        func: Callable[[datetime], Awaitable],
+        offset: timedelta = timedelta(0),
+        catch_up: bool = True,
+        max_catch_up: int = 12,
+    ):
+        """Instantiate Job.
+
+        Args:
+            name (str): Name of the job, used for logging.
+            interval (timedelta): Time between two ticks.
+            func (Callable[[datetime], Awaitable]): Coroutine function called with the tick.
+            offset (timedelta): Offset of the ticks from the interval boundaries.
+            catch_up (bool): Whether to run every missed tick, or only the latest one.
+            max_catch_up (int): Maximum number of missed ticks to run.
+        """
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.offset = offset
+        self.catch_up = catch_up
+        self.max_catch_up = max_catch_up
+        self.lock = asyncio.Lock()
+        self.last_tick: datetime | None = None
+
+    def latest_tick(self, now: datetime) -> datetime:
+        """Get the most recent tick at or before `now`."""
+        periods = (now - EPOCH - self.offset) // self.interval
+        return EPOCH + self.offset + periods * self.interval
+
+    def next_tick(self, now: datetime) -> datetime:
+        """Get the first tick after `now`."""
+        return self.latest_tick(now) + self.interval
+
+    def due(self, now: datetime) -> list[datetime]:
+        """Get the ticks that are due at `now` and have not run yet."""
+        latest = self.latest_tick(now)
+        if self.last_tick is None:
+            return [latest]
+        if latest <= self.last_tick:
+            return []
+        if not self.catch_up:
+            return [latest]
+
+        missed = (latest - self.last_tick) // self.interval
+        if missed > self.max_catch_up:
+            logger.warning(
+                f"Job {self.name} missed {missed} ticks, "
+                f"catching up on the last {self.max_catch_up}"
+            )
+            missed = self.max_catch_up
+        return [latest - i * self.interval for i in reversed(range(missed))]
+
+
+class Scheduler:
+    """Run jobs on their intervals until cancelled."""
+
+    def __init__(self, jobs: list[Job] = None, leader: Leader = None):
+        """Instantiate Scheduler.
+
+        Args:
+            jobs (list[Job], optional): Jobs to run.
+            leader (Leader, optional): Election checked before every tick, jobs
+                only run while `leader.is_leader()` is True.
+        """
+        self.jobs = jobs or []
+        self.leader = leader
+
+    def add_job(self, job: Job):
+        """Add a job to the scheduler."""
+        self.jobs.append(job)
+
+    async def run_job(self, job: Job, tick: datetime):
+        """Run a single tick of a job, skipping it if the job is still running."""
+        if job.lock.locked():
+            logger.warning(f"Job {job.name} is still running, skipping {tick}")
+            return
+        async with job.lock:
+            logger.info(f"Running job {job.name} for {tick}")
+            start = datetime.now()
+            try:
+                await job.func(tick)
+            except Exception:
+                logger.exception(f"Job {job.name} failed for {tick}")
+            logger.info(f"Job {job.name} finished in {datetime.now() - start}")
+            job.last_tick = tick
+
+    async def is_leader(self) -> bool:
+        if self.leader is None:
+            return True
+        try:
+            return await asyncio.to_thread(self.leader.is_leader)
+        except Exception:
+            logger.exception("Leader election failed")
+            return False
+
+    async def _loop(self, job: Job):
+        while True:
+            due = job.due(datetime.now())
+            if due and not await self.is_leader():
+                # a standby does not catch up on ticks run by the leader
+                logger.info(f"Not the leader, skipping job {job.name} for {due[-1]}")
+                job.last_tick = due[-1]
+                due = []
+            for tick in due:
+                await self.run_job(job, tick)
+            delay = (job.next_tick(datetime.now()) - datetime.now()).total_seconds()
+            await asyncio.sleep(max(delay, 0))
+
+    async def run(self):
+        """Run all jobs forever."""
+        logger.info(f"Starting scheduler with jobs {[j.name for j in self.jobs]}")
+        await asyncio.gather(*(self._loop(job) for job in self.jobs))
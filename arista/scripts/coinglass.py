@@ -1,8 +1,7 @@
 import logging
-import time
 from datetime import datetime, timedelta
 
-from arista import models
+from arista import metrics, models
 from arista.api.coinglass import CoinglassAPI
 from arista.api.coinmarketcap import CoinMarketCapAPI
 
@@ -14,28 +13,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-client = CoinglassAPI()
-
 
 def sync_database(
+    client: CoinglassAPI,
     repository,
     start_time: datetime,
     end_time: datetime,
     symbol: str,
     interval: str,
+    max_: datetime = None,
 ):
-    """Sync database with funding rates from Coinglass API."""
+    """Sync database with funding rates from Coinglass API.
+
+    `max_` is the latest timestamp of the symbol in the database, it is queried
+    if not given.
+    """
 
     logger.info(
         f"Updating {repository._model.__tablename__} for "
         f"symbol {symbol} until {end_time}"
     )
 
-    filters = [("symbol", symbol)]
-    min_, max_ = repository.min_timestamp(filters=filters), repository.max_timestamp(
-        filters=filters
-    )
-    logger.info(f"Current range in database for {symbol}: {min_} - {max_}")
+    if max_ is None:
+        max_ = repository.max_timestamp(filters=[("symbol", symbol)])
+    logger.info(f"Latest data in database for {symbol}: {max_}")
 
     if max_ is not None and max_ > end_time:
         logger.info(f"Data in database for {symbol} is up to date until {end_time}")
@@ -69,17 +70,15 @@ def sync_database(
             f"Inserting {len(records)} records into the database "
             f"from range ({records_min} - {records_max})"
         )
-        repository.bulk_create(records)
+        repository.bulk_create(records, isolate_errors=True)
     else:
         logger.warning(f"Found {records} records to insert")
 
 
-def main():
-    """Sync script to fetch funding rates from
-    Coinglass API and store them in the database."""
+def get_symbols(client: CoinglassAPI, cmc_client: CoinMarketCapAPI) -> list[str]:
+    """Get the top 100 CoinMarketCap symbols that are supported on Coinglass."""
 
     logger.info(f"Fetching latest top 100 coins from CoinMarketCap")
-    cmc_client = CoinMarketCapAPI()
     data = cmc_client.listing_latest()
     top100_symbols = [d.symbol for d in data]
     logger.info(f"Top 100 symbols: {top100_symbols}")
@@ -90,23 +89,47 @@ def main():
     logger.info(f"Filtering out unsupported symbols")
     symbols = [s for s in symbols if s in top100_symbols]
     logger.info(f"Filtered symbols: {len(symbols)}")
+    return symbols
+
+
+def sync(client: CoinglassAPI, symbols: list[str], repositories: list = None):
+    """Sync open interest of the given symbols from Coinglass API."""
 
     start_time = datetime.now() - timedelta(days=350)
     end_time = datetime.now()
 
     # TODO: Add Funding Rate after pipeline is fixed
     # repositories = [models.FundingRateRepository(), models.OpenInterestRepository()]
-    for repository in [models.OpenInterestRepository()]:
+    for repository in repositories or [models.OpenInterestRepository()]:
+        # latest timestamp of every symbol in one query instead of one per symbol
+        col = repository.timestamp_col
+        latest = {
+            row.symbol: datetime.utcfromtimestamp(getattr(row, col))
+            for row in repository.latest("symbol", columns=["symbol"])
+        }
         for symbol in symbols:
-            time.sleep(2)
+            # a shared limiter paces the requests of all processes instead
+            if client.rate_limiter is None:
+                metrics.wait("coinglass", 2)
             sync_database(
+                client=client,
                 repository=repository,
                 start_time=start_time,
                 end_time=end_time,
                 symbol=symbol,
                 interval=INTERVAL,
+                max_=latest.get(symbol),
             )
 
 
+def main():
+    """Sync script to fetch funding rates from
+    Coinglass API and store them in the database."""
+
+    client = CoinglassAPI()
+    symbols = get_symbols(client, CoinMarketCapAPI())
+    sync(client, symbols)
+
+
 if __name__ == "__main__":
     main()
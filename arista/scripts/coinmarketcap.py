@@ -12,10 +12,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    # get data from Coinglass API
-    client = CoinMarketCapAPI()
-    repository = models.CoinMarketCapHistoryRepository()
+def sync(client: CoinMarketCapAPI, repository=None):
+    """Store the latest CoinMarketCap listing in the database."""
+    repository = repository or models.CoinMarketCapHistoryRepository()
 
     logger.info(f"Fetching latest coinmarketcap data for top 100 cryptocurrencies")
     data = client.listing_latest()
@@ -29,5 +28,9 @@ def main():
     repository.bulk_create(data)
 
 
+def main():
+    sync(CoinMarketCapAPI())
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,30 @@
+"""Update the constant maturity basis table from new Deribit futures snapshots.
+
+After a backfill of older snapshots, set `CONSTANT_MATURITY_START` (ISO date,
+naive UTC) to recompute the basis from that time.
+"""
+
+import logging
+import os
+from datetime import datetime
+
+from arista.analytics import ConstantMaturityEngine
+
+TENORS = (30, 60, 90)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    start = os.environ.get("CONSTANT_MATURITY_START")
+    engine = ConstantMaturityEngine(tenors=TENORS)
+    count = engine.run(datetime.fromisoformat(start) if start else None)
+    logger.info(f"Wrote {count} constant maturity basis records")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,12 @@
 
 import asyncio
 import logging
-import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-import enlighten
-
-from arista import models
+from arista import metrics
 from arista.api.deribit import DeribitAPI, Future
+from arista.buffer import RecordBuffer
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,10 +16,16 @@ logging.basicConfig(
 logger = logging.getLogger()
 
 
-manager = enlighten.get_manager()
-
-client = DeribitAPI()
 resolution = 360
+TARGET = "deribit_futures"
+
+
+@lru_cache
+def get_manager():
+    """Get the progress bar manager, created on first use."""
+    import enlighten
+
+    return enlighten.get_manager()
 
 
 def get_nearest_resolution_time(current_time: datetime, resolution_minutes: int):
@@ -37,17 +42,36 @@ def get_nearest_resolution_time(current_time: datetime, resolution_minutes: int)
     return rounded_time
 
 
-async def fetch(symbol="BTC"):
-    """Async function to fetch Deribit data for a given symbol."""
+async def fetch(
+    symbol="BTC",
+    date: datetime = None,
+    api: DeribitAPI = None,
+    buffer: RecordBuffer = None,
+):
+    """Async function to fetch Deribit data for a given symbol.
+
+    Records are appended to the durable buffer as they arrive and flushed to
+    the database at the end, so a database error does not lose the fetched data.
+
+    Args:
+        symbol (str): BTC or ETH.
+        date (datetime, optional): Time to fetch the snapshot for, rounded down
+            to the resolution. Defaults to now.
+        api (DeribitAPI, optional): Client to reuse. Defaults to a new client.
+        buffer (RecordBuffer, optional): Buffer to write records to.
+    """
 
-    global client
     global resolution
+    api = api or DeribitAPI()
+    buffer = buffer or RecordBuffer()
 
-    date = get_nearest_resolution_time(datetime.now(), resolution)
+    date = get_nearest_resolution_time(date or datetime.now(), resolution)
 
-    pbar = manager.counter(total=len(Future), desc=f"{symbol} futures", unit="ticks")
+    pbar = get_manager().counter(
+        total=len(Future), desc=f"{symbol} futures", unit="ticks"
+    )
 
-    data = []
+    fetched = 0
     no_data = []
     failed = []
 
@@ -58,23 +82,23 @@ async def fetch(symbol="BTC"):
     for future in Future:
 
         logger.info(f"Fetching data for {date_string}: {future}, {symbol}")
-        time.sleep(0.1)
+        await metrics.async_wait("deribit", 0.1)
         counter += 1
 
         try:
-            instruments = await client.get_historical_instruments(
-                date=date, symbol=symbol
-            )
+            instruments = await api.get_historical_instruments(date=date, symbol=symbol)
             instrument_name = instruments[future][symbol]
 
-            d = await client.get_future_data_from_instrument_name(
+            d = await api.get_future_data_from_instrument_name(
                 date=date,
                 future=future,
                 instrument_name=instrument_name,
                 symbol=symbol,
                 resolution=resolution,
             )
-            data.append(d)
+            await asyncio.to_thread(buffer.append, TARGET, [d])
+            fetched += 1
+            metrics.FETCH_RESULTS.labels("deribit", "ok").inc()
             logger.info(
                 "Successfully obtained Deribit future data for"
                 f" {date_string}, future {future}, symbol {symbol}"
@@ -86,6 +110,7 @@ async def fetch(symbol="BTC"):
                 f"No data for {date_string} for instrument "
                 f"{instrument_name}, {future}, symbol {symbol}"
             )
+            metrics.FETCH_RESULTS.labels("deribit", "no_data").inc()
             no_data.append(
                 {
                     "date": date,
@@ -100,6 +125,7 @@ async def fetch(symbol="BTC"):
                 f"Failed request {date_string} for instrument "
                 f"{instrument_name}, {future}, symbol {symbol}"
             )
+            metrics.FETCH_RESULTS.labels("deribit", "failed").inc()
             failed.append(
                 {
                     "date": date,
@@ -115,14 +141,15 @@ async def fetch(symbol="BTC"):
         logger.info(f"Failed records: {len(failed)}")
         logger.info(f"No data records: {len(no_data)}")
 
-    logger.info(f"Inserting {len(data)} records into the database, {symbol}")
-    repository = models.DeribitFuturesRepository()
-    repository.bulk_create(data)
+    logger.info(f"Fetched {fetched} records, flushing buffer to the database, {symbol}")
+    await asyncio.to_thread(buffer.drain, TARGET)
 
 
 async def main_async():
-    await fetch("BTC")
-    await fetch("ETH")
+    api = DeribitAPI()
+    buffer = RecordBuffer()
+    await fetch("BTC", api=api, buffer=buffer)
+    await fetch("ETH", api=api, buffer=buffer)
 
 
 def main():
@@ -2,13 +2,12 @@
 
 import asyncio
 import logging
-import time
 from datetime import datetime, timedelta
 
-import enlighten
-
-from arista import models
+from arista import metrics
 from arista.api.deribit import DeribitAPI, Future
+from arista.buffer import RecordBuffer
+from arista.scripts.deribit import get_manager
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,15 +16,15 @@ logging.basicConfig(
 logger = logging.getLogger()
 
 
-manager = enlighten.get_manager()
-
-client = DeribitAPI()
+TARGET = "deribit_futures"
 
 
-async def fetch(symbol="ETH"):
+async def fetch(symbol="ETH", client: DeribitAPI = None, buffer: RecordBuffer = None):
     """Async function to fetch Deribit data for a given symbol."""
 
-    global client
+    client = client or DeribitAPI()
+    buffer = buffer or RecordBuffer()
+    manager = get_manager()
     start_date = datetime.strptime("2024-11-01", client.DATE_FORMAT)
     end_date = datetime.strptime("2024-12-08", client.DATE_FORMAT)
     dates = [
@@ -36,7 +35,7 @@ async def fetch(symbol="ETH"):
         pbar = manager.counter(total=len(dates), desc="Dates", unit="ticks")
         logger.info(f"Fetching data for {future}, {symbol}")
 
-        data = []
+        fetched = 0
         no_data = []
         failed = []
 
@@ -44,7 +43,7 @@ async def fetch(symbol="ETH"):
 
         for date in dates:
             date_string = date.strftime(client.DATE_FORMAT)
-            time.sleep(0.1)
+            await metrics.async_wait("deribit", 0.1)
             counter += 1
 
             try:
@@ -59,7 +58,9 @@ async def fetch(symbol="ETH"):
                     instrument_name=instrument_name,
                     symbol=symbol,
                 )
-                data.append(d)
+                await asyncio.to_thread(buffer.append, TARGET, [d])
+                fetched += 1
+                metrics.FETCH_RESULTS.labels("deribit", "ok").inc()
                 logger.info(
                     "Successfully obtained Deribit future data for"
                     f" {date_string}, future {future}, symbol {symbol}"
@@ -69,6 +70,7 @@ async def fetch(symbol="ETH"):
                     f"No data for {date_string} for instrument "
                     f"{instrument_name}, {future}, symbol {symbol}"
                 )
+                metrics.FETCH_RESULTS.labels("deribit", "no_data").inc()
                 no_data.append(
                     {
                         "date": date,
@@ -83,6 +85,7 @@ async def fetch(symbol="ETH"):
                     f"Failed request {date_string} for instrument "
                     f"{instrument_name}, {future}, symbol {symbol}"
                 )
+                metrics.FETCH_RESULTS.labels("deribit", "failed").inc()
                 failed.append(
                     {
                         "date": date,
@@ -99,11 +102,15 @@ async def fetch(symbol="ETH"):
         logger.info(f"No data records: {len(no_data)}")
 
         logger.info(
-            f"Inserting {len(data)} records into the database {future}, {symbol}"
+            f"Fetched {fetched} records, flushing buffer to the database {future}, {symbol}"
         )
-        repository = models.DeribitFuturesRepository()
-        repository.bulk_create(data)
-        time.sleep(2)
+        await asyncio.to_thread(buffer.drain, TARGET)
+        await metrics.async_wait("deribit", 2)
+
+
+def main():
+    asyncio.run(fetch())
 
 
-asyncio.run(fetch())
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Stream Deribit futures tickers into the database over a WebSocket."""
+
+import asyncio
+import logging
+import os
+
+from arista.api.deribit_stream import DeribitStream
+
+RESOLUTION = 60
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    stream = DeribitStream(
+        resolution=int(os.environ.get("DERIBIT_STREAM_RESOLUTION", RESOLUTION)),
+        url=os.environ.get("DERIBIT_WS_URL"),
+    )
+    asyncio.run(stream.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Claim and run fetch jobs until stopped, start as many as the API budgets allow.
+
+`WORKER_NAME` defaults to `<hostname>-<pid>`, `WORKER_LEASE_MINUTES` sets how
+long a claimed job is held before other workers may take it over, and
+`WORKER_PROVIDER` restricts the worker to one provider. With
+`WORKER_EXIT_WHEN_EMPTY` set the worker stops once no job is left.
+"""
+
+import logging
+import os
+from datetime import timedelta
+
+from arista.jobs import FetchWorker
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    with FetchWorker(
+        name=os.environ.get("WORKER_NAME"),
+        lease=timedelta(minutes=float(os.environ.get("WORKER_LEASE_MINUTES", 10))),
+        batch_size=int(os.environ.get("WORKER_BATCH_SIZE", 10)),
+        provider=os.environ.get("WORKER_PROVIDER"),
+    ) as worker:
+        worker.run(stop_when_empty=bool(os.environ.get("WORKER_EXIT_WHEN_EMPTY")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Flush records left in the local write-ahead buffer to the database."""
+
+import logging
+
+from arista.buffer import RecordBuffer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    buffer = RecordBuffer()
+    logger.info(f"Pending records in {buffer.path}: {buffer.pending()}")
+    count = buffer.drain_all()
+    logger.info(f"Flushed {count} records")
+
+
+if __name__ == "__main__":
+    main()
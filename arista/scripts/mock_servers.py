@@ -0,0 +1,59 @@
+"""Run the local API stand-ins until interrupted.
+
+Configured through `MOCK_HOST`, `MOCK_PORT`, `MOCK_WS_PORT`, `MOCK_LATENCY`,
+`MOCK_JITTER`, `MOCK_RATE_LIMIT`, `MOCK_ERROR_RATE` and `MOCK_RECORDED`.
+"""
+
+import asyncio
+import logging
+import os
+
+from arista.mock import Faults, MockAPIServer, MockDeribitWebSocket
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+PORT = 8765
+WS_PORT = 8766
+
+
+def faults_from_env() -> Faults:
+    rate_limit = os.environ.get("MOCK_RATE_LIMIT")
+    return Faults(
+        latency=float(os.environ.get("MOCK_LATENCY", 0)),
+        jitter=float(os.environ.get("MOCK_JITTER", 0)),
+        rate_limit=int(rate_limit) if rate_limit else None,
+        error_rate=float(os.environ.get("MOCK_ERROR_RATE", 0)),
+    )
+
+
+async def serve():
+    host = os.environ.get("MOCK_HOST", "127.0.0.1")
+    faults = faults_from_env()
+    with MockAPIServer(
+        host=host,
+        port=int(os.environ.get("MOCK_PORT", PORT)),
+        faults=faults,
+        recorded=os.environ.get("MOCK_RECORDED"),
+    ) as server:
+        async with MockDeribitWebSocket(
+            host=host, port=int(os.environ.get("MOCK_WS_PORT", WS_PORT)), faults=faults
+        ) as ws:
+            env = {**server.env(), "DERIBIT_WS_URL": ws.url}
+            for key, value in env.items():
+                logger.info(f"export {key}={value}")
+            await asyncio.Future()
+
+
+def main():
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logger.info("Stopped mock servers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Enqueue the fetch jobs of a backfill for the fetch workers.
+
+The window is set with `BACKFILL_START` and `BACKFILL_END` (ISO dates, naive
+UTC, the end defaults to now) and the providers with `BACKFILL_PROVIDERS`
+(comma separated, defaults to all). Coinglass symbols are the supported coins
+of the CoinMarketCap top 100, Deribit assets are set with `BACKFILL_ASSETS`
+(defaults to BTC,ETH). Planning is idempotent, jobs that already
+exist are skipped whatever their status.
+"""
+
+import logging
+import os
+from datetime import datetime
+
+from arista import jobs
+from arista.api.coinglass import CoinglassAPI
+from arista.api.coinmarketcap import CoinMarketCapAPI
+from arista.models.fetch_job import FetchJobRepository
+from arista.scripts.coinglass import get_symbols
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("coinglass", "deribit", "coinmarketcap")
+
+
+def main():
+    start = datetime.fromisoformat(os.environ["BACKFILL_START"])
+    end = os.environ.get("BACKFILL_END")
+    end = datetime.fromisoformat(end) if end else datetime.utcnow()
+    providers = os.environ.get("BACKFILL_PROVIDERS", ",".join(PROVIDERS)).split(",")
+    unknown = set(providers) - set(PROVIDERS)
+    if unknown:
+        raise ValueError(f"Unknown providers {unknown}, expected any of {PROVIDERS}")
+
+    planned = []
+    if "coinglass" in providers:
+        symbols = get_symbols(CoinglassAPI(), CoinMarketCapAPI())
+        planned += jobs.plan_open_interest(symbols, start, end)
+    if "deribit" in providers:
+        assets = os.environ.get("BACKFILL_ASSETS", "BTC,ETH").split(",")
+        planned += jobs.plan_deribit(assets, start, end)
+    if "coinmarketcap" in providers:
+        planned += jobs.plan_coinmarketcap(start, end)
+
+    repository = FetchJobRepository()
+    inserted = repository.enqueue(planned)
+    logger.info(f"Planned {len(planned)} jobs, {inserted} new: {repository.counts()}")
+
+
+if __name__ == "__main__":
+    main()
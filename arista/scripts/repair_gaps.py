@@ -0,0 +1,29 @@
+"""Detect missing intervals in the time series tables and fetch only those."""
+
+import asyncio
+import logging
+
+from arista.gaps import GapRepairer, find_gaps
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    repairer = GapRepairer()
+
+    inserted = repairer.repair_open_interest(find_gaps("open_interest"))
+    logger.info(f"Repaired {inserted} open interest records")
+
+    inserted = asyncio.run(repairer.repair_deribit(find_gaps("deribit_futures")))
+    logger.info(f"Repaired {inserted} Deribit futures records")
+
+    inserted = repairer.repair_coinmarketcap(find_gaps("coinmarketcap"))
+    logger.info(f"Repaired {inserted} CoinMarketCap records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Long-running daemon hosting the Deribit, CoinMarketCap and Coinglass syncs.
+
+Clients, their connection pools, repositories and the Coinglass symbol universe
+are created once and reused across runs instead of per invocation. With
+`ARISTA_LEADER_ELECTION` set, any number of schedulers can be started and only
+the one holding the `scheduler` advisory lock runs the jobs.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+from arista import metrics, models
+from arista.analytics import ConstantMaturityEngine, SignalEngine
+from arista.api.coinglass import CoinglassAPI
+from arista.api.coinmarketcap import CoinMarketCapAPI
+from arista.api.deribit import DeribitAPI
+from arista.buffer import RecordBuffer
+from arista.coordination import LeaderLock
+from arista.scheduler import Job, Scheduler
+from arista.scripts import coinglass, coinmarketcap, deribit
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+SYMBOLS_TTL = timedelta(hours=24)
+OFFSET = timedelta(minutes=10)
+METRICS_PORT = "ARISTA_METRICS_PORT"
+METRICS_TABLE = "ARISTA_METRICS_TABLE"
+LEADER_ELECTION = "ARISTA_LEADER_ELECTION"
+METRICS_RETENTION = timedelta(days=30)
+
+
+class Collectors:
+    """Clients, repositories and caches shared by all scheduled runs."""
+
+    def __init__(self):
+        self.coinglass = CoinglassAPI()
+        self.cmc = CoinMarketCapAPI()
+        self.deribit = DeribitAPI()
+        self.buffer = RecordBuffer()
+        self.open_interest = models.OpenInterestRepository()
+        self.cmc_history = models.CoinMarketCapHistoryRepository()
+        self.constant_maturity = ConstantMaturityEngine()
+        self.signals = SignalEngine(source="open_interest")
+        self.metrics = models.MetricSampleRepository()
+        self._symbols: list[str] | None = None
+        self._symbols_at: datetime | None = None
+
+    def coinglass_symbols(self) -> list[str]:
+        """Get the Coinglass symbol universe, refreshed every `SYMBOLS_TTL`."""
+        now = datetime.now()
+        if self._symbols is None or now - self._symbols_at > SYMBOLS_TTL:
+            self._symbols = coinglass.get_symbols(self.coinglass, self.cmc)
+            self._symbols_at = now
+        return self._symbols
+
+    async def sync_deribit(self, tick: datetime):
+        for symbol in ["BTC", "ETH"]:
+            await deribit.fetch(symbol, date=tick, api=self.deribit, buffer=self.buffer)
+        await asyncio.to_thread(self.constant_maturity.run)
+
+    async def flush_buffer(self, tick: datetime):
+        await asyncio.to_thread(self.buffer.drain_all)
+
+    async def write_metrics(self, tick: datetime):
+        await asyncio.to_thread(self.metrics.write_snapshot, "scheduler")
+
+    async def prune_metrics(self, tick: datetime):
+        deleted = await asyncio.to_thread(self.metrics.prune, METRICS_RETENTION)
+        logger.info(f"Deleted {deleted} metric samples older than {METRICS_RETENTION}")
+
+    async def sync_cmc(self, tick: datetime):
+        await asyncio.to_thread(coinmarketcap.sync, self.cmc, self.cmc_history)
+
+    async def sync_coinglass(self, tick: datetime):
+        def sync():
+            symbols = self.coinglass_symbols()
+            coinglass.sync(self.coinglass, symbols, [self.open_interest])
+            self.signals.run(symbols)
+
+        await asyncio.to_thread(sync)
+
+
+def build_scheduler(collectors: Collectors, leader: LeaderLock = None) -> Scheduler:
+    """Register all collectors with their intervals."""
+    scheduler = Scheduler(
+        [
+            Job(
+                "deribit",
+                timedelta(minutes=deribit.resolution),
+                collectors.sync_deribit,
+                offset=OFFSET,
+            ),
+            Job(
+                "coinmarketcap",
+                timedelta(hours=4),
+                collectors.sync_cmc,
+                offset=OFFSET,
+                catch_up=False,
+            ),
+            Job(
+                "coinglass",
+                timedelta(hours=12),
+                collectors.sync_coinglass,
+                offset=OFFSET,
+                catch_up=False,
+            ),
+            Job(
+                "buffer",
+                timedelta(minutes=1),
+                collectors.flush_buffer,
+                catch_up=False,
+            ),
+        ],
+        leader=leader,
+    )
+    if os.environ.get(METRICS_TABLE):
+        scheduler.add_job(
+            Job(
+                "metrics",
+                timedelta(minutes=1),
+                collectors.write_metrics,
+                catch_up=False,
+            )
+        )
+        scheduler.add_job(
+            Job(
+                "metrics_retention",
+                timedelta(days=1),
+                collectors.prune_metrics,
+                offset=OFFSET,
+                catch_up=False,
+            )
+        )
+    return scheduler
+
+
+def main():
+    if port := os.environ.get(METRICS_PORT):
+        metrics.serve(int(port))
+    leader = LeaderLock("scheduler") if os.environ.get(LEADER_ELECTION) else None
+    scheduler = build_scheduler(Collectors(), leader)
+    asyncio.run(scheduler.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Update the signals table from new open interest and funding rate candles."""
+
+import logging
+
+from arista.analytics import SignalEngine
+
+SOURCES = ["open_interest", "funding_rate"]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s:%(funcName)s:%(lineno)d] %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    for source in SOURCES:
+        count = SignalEngine(source=source).run()
+        logger.info(f"Inserted {count} {source} signals")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Timing, summary statistics and JSON result files shared by the benchmarks."""
+
+import json
+import os
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class Timer:
+    """Collect the duration and row count of every run of each stage."""
+
+    def __init__(self):
+        self.samples: dict[str, list[tuple[float, int]]] = {}
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0):
+        """Time one run of a stage; `rows` can also be set on the yielded dict."""
+        run = {"rows": rows}
+        start = time.perf_counter()
+        yield run
+        elapsed = time.perf_counter() - start
+        self.samples.setdefault(name, []).append((elapsed, run["rows"]))
+
+    def summary(self) -> dict[str, dict]:
+        """Rows per second and latency percentiles in milliseconds per stage."""
+        return {name: summarise(samples) for name, samples in self.samples.items()}
+
+
+def summarise(samples: list[tuple[float, int]]) -> dict:
+    seconds = np.array([s for s, _ in samples])
+    rows = sum(r for _, r in samples)
+    return {
+        "runs": len(samples),
+        "rows": rows,
+        "rows_per_sec": rows / seconds.sum() if seconds.sum() else None,
+        "p50_ms": float(np.percentile(seconds, 50) * 1000),
+        "p99_ms": float(np.percentile(seconds, 99) * 1000),
+    }
+
+
+def use_database() -> str:
+    """Point the repositories at `$BENCH_DATABASE_URL`, or a throwaway SQLite file.
+
+    Must be called before the first repository is created.
+    """
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if url is None:
+        path = Path(tempfile.mkdtemp(prefix="arista-bench-")) / "bench.sqlite"
+        url = f"sqlite:///{path}"
+    os.environ["POSTGRES_DATABASE_URL"] = url
+    return url
+
+
+def create_tables():
+    from sqlmodel import SQLModel
+
+    from arista import models  # noqa: F401 register all tables
+    from arista.db.session import get_engine
+
+    SQLModel.metadata.create_all(get_engine())
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(name: str, results: dict, output: str | Path = None) -> Path:
+    """Write results with the revision and time they were measured at.
+
+    Defaults to `benchmarks/results/<name>-<revision>.json`, so files of two
+    commits can be compared with `compare`.
+    """
+    revision = git_revision()
+    payload = {
+        "benchmark": name,
+        "revision": revision,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **results,
+    }
+    path = Path(output or RESULTS_DIR / f"{name}-{revision or 'unknown'}.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    return path
+
+
+def compare(baseline: dict, current: dict, path: tuple = ()) -> list[str]:
+    """Describe the relative change of every throughput, latency and memory value."""
+    lines = []
+    for key, value in current.items():
+        before = baseline.get(key) if isinstance(baseline, dict) else None
+        if isinstance(value, dict):
+            lines += compare(before or {}, value, path + (key,))
+        elif (
+            key in ("rows_per_sec", "p99_ms", "peak_rss_mb")
+            and before
+            and value is not None
+        ):
+            change = (value - before) / before * 100
+            lines.append(
+                f"{'/'.join(path + (key,))}: {before:.4g} -> {value:.4g} ({change:+.1f}%)"
+            )
+    return lines
+
+
+def print_summary(results: dict[str, dict[str, dict]]):
+    print(f"{'target':<16}{'stage':<10}{'rows/s':>14}{'p50 ms':>10}{'p99 ms':>10}")
+    for target, stages in results.items():
+        for stage, stats in stages.items():
+            rows_per_sec = stats["rows_per_sec"] or 0
+            print(
+                f"{target:<16}{stage:<10}{rows_per_sec:>14,.0f}"
+                f"{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+            )
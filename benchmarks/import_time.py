@@ -0,0 +1,70 @@
+"""Check the import time budget of the CLI and the cron scripts.
+
+Every module is imported `RUNS` times in a fresh interpreter with
+`-X importtime`, and the fastest run is compared to its budget to filter out
+noise. The check fails if a module takes longer than its budget or pulls in a
+heavy dependency its code path does not need, e.g. pandas for a plain sync.
+Budgets sit just above the measured times of the lazy imports, well below the
+~750 ms the scripts took with eager imports.
+
+    python -m benchmarks.import_time
+"""
+
+import re
+import subprocess
+import sys
+
+HEAVY = ("pandas", "numpy", "sqlalchemy", "httpx", "requests")
+RUNS = 5
+
+# module -> (budget in milliseconds, modules it must not import)
+BUDGETS = {
+    "arista.cli": (50, HEAVY),
+    "arista.scripts.coinglass": (700, ("pandas", "numpy", "httpx")),
+    "arista.scripts.coinmarketcap": (700, ("pandas", "numpy", "httpx")),
+    "arista.scripts.deribit": (700, ("pandas", "numpy")),
+    "arista.scripts.flush_buffer": (700, ("pandas", "numpy", "httpx", "requests")),
+}
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for match in LINE.finditer(result.stderr):
+        times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def check(module: str, budget_ms: float, forbidden: tuple) -> list[str]:
+    runs = [import_times(module) for _ in range(RUNS)]
+    times = min(runs, key=lambda run: run[module])
+    errors = []
+    elapsed_ms = times[module] / 1000
+    if elapsed_ms > budget_ms:
+        errors.append(f"{module} took {elapsed_ms:.0f} ms, budget {budget_ms} ms")
+    for name in forbidden:
+        if name in times:
+            errors.append(f"{module} imports {name}")
+    print(f"{module:<32}{elapsed_ms:>8.0f} ms (budget {budget_ms} ms)")
+    return errors
+
+
+def main():
+    errors = []
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        errors += check(module, budget_ms, forbidden)
+    for error in errors:
+        print(f"FAIL: {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
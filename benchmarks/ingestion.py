@@ -0,0 +1,221 @@
+"""End to end ingestion benchmark per upstream API.
+
+Every client fetches from the local mock servers and each run is split into
+the pipeline stages
+
+- fetch: HTTP request and JSON decoding (`_get`)
+- build: validation of the payload into records (client method on a stored payload)
+- insert: `bulk_create` into the database
+- read: reading the inserted rows back into a DataFrame
+
+Rows per second and p50/p99 latencies per stage are printed and written to
+`benchmarks/results/ingestion-<revision>.json`. The database is
+`$BENCH_DATABASE_URL` (use a throwaway Postgres) or a temporary SQLite file.
+
+    python -m benchmarks.ingestion --runs 20 --compare benchmarks/results/ingestion-abc1234.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+from benchmarks.common import (
+    Timer,
+    compare,
+    create_tables,
+    print_summary,
+    use_database,
+    write_results,
+)
+
+# fixed clock of the mock servers so every run sees the same payloads
+NOW = 1735689600
+DERIBIT_WINDOWS = 50
+DERIBIT_RESOLUTION = 360
+
+
+def _serve_payload(payload):
+    def _get(*args, **kwargs):
+        return payload
+
+    return _get
+
+
+def _serve_payload_async(payloads: dict):
+    async def _get(path, params=None, **kwargs):
+        return payloads[params["instrument_name"], params["end_timestamp"]]
+
+    return _get
+
+
+def bench_coinglass(timer: Timer, runs: int):
+    from arista.api.coinglass import CoinglassAPI
+    from arista.mock.fixtures import SYMBOLS
+    from arista.models import OpenInterestRepository
+
+    client = CoinglassAPI()
+    repository = OpenInterestRepository()
+    path = "/futures/openInterest/ohlc-aggregated-history"
+    for i in range(runs):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        params = {"symbol": symbol, "interval": "12h", "limit": client.RESPONSE_LIMIT}
+        with timer.stage("fetch") as run:
+            payload = client._get(path=path, params=params)
+            run["rows"] = len(payload)
+
+        client._get = _serve_payload(payload)
+        with timer.stage("build", len(payload)):
+            records = client.get_aggregated_open_interest_history(symbol, "12h")
+        del client._get
+
+        repository.delete_where("symbol", symbol)
+        with timer.stage("insert", len(records)):
+            repository.bulk_create(records)
+        with timer.stage("read") as run:
+            df = repository.read_after(None, filters=[("symbol", symbol)], as_df=True)
+            run["rows"] = len(df)
+
+
+def bench_coinmarketcap(timer: Timer, runs: int):
+    from arista.api.coinmarketcap import CoinMarketCapAPI
+    from arista.models import CoinMarketCapHistoryRepository
+
+    client = CoinMarketCapAPI()
+    repository = CoinMarketCapHistoryRepository()
+    for i in range(runs):
+        date = (datetime.utcfromtimestamp(NOW) - timedelta(days=i + 1)).date()
+        date = date.isoformat()
+        with timer.stage("fetch") as run:
+            payload = client._get("/listings/historical", params={"date": date})
+            run["rows"] = len(payload)
+
+        client._get = _serve_payload(payload)
+        with timer.stage("build", len(payload)):
+            records = client.listing_historical(date=date)
+        del client._get
+
+        repository.delete_where("iso_date", date)
+        with timer.stage("insert", len(records)):
+            repository.bulk_create(records)
+        with timer.stage("read") as run:
+            df = repository.read_after(None, filters=[("iso_date", date)], as_df=True)
+            run["rows"] = len(df)
+
+
+async def _bench_deribit(timer: Timer, runs: int):
+    from arista.api.deribit import DeribitAPI
+    from arista.models import DeribitFuturesRepository
+
+    client = DeribitAPI()
+    repository = DeribitFuturesRepository()
+    for i in range(runs):
+        # one run fetches every future of `DERIBIT_WINDOWS` consecutive windows
+        first = datetime.fromtimestamp(NOW) - timedelta(days=30 * (i + 1))
+        dates = [
+            first + timedelta(minutes=DERIBIT_RESOLUTION * k)
+            for k in range(DERIBIT_WINDOWS)
+        ]
+        requests = []
+        for date in dates:
+            instruments = await client.get_historical_instruments(date, symbol="BTC")
+            for future, names in instruments.items():
+                requests.append((date, future, names["BTC"]))
+
+        def params(date, name):
+            end = int(date.timestamp())
+            return {
+                "start_timestamp": (end - DERIBIT_RESOLUTION * 60) * 1000,
+                "end_timestamp": end * 1000,
+                "instrument_name": name,
+                "resolution": DERIBIT_RESOLUTION,
+            }
+
+        with timer.stage("fetch", len(requests)):
+            responses = await asyncio.gather(
+                *[
+                    client._get("/get_tradingview_chart_data", params(date, name))
+                    for date, _, name in requests
+                ]
+            )
+        payloads = {
+            (name, params(date, name)["end_timestamp"]): response
+            for (date, _, name), response in zip(requests, responses)
+        }
+
+        client._get = _serve_payload_async(payloads)
+        with timer.stage("build", len(requests)):
+            records = await asyncio.gather(
+                *[
+                    client.get_future_data_from_instrument_name(
+                        date=date,
+                        future=future,
+                        instrument_name=name,
+                        symbol="BTC",
+                        resolution=DERIBIT_RESOLUTION,
+                    )
+                    for date, future, name in requests
+                ]
+            )
+        del client._get
+
+        repository.delete_where("asset", "BTC")
+        with timer.stage("insert", len(records)):
+            repository.bulk_create(list(records))
+        with timer.stage("read") as run:
+            df = repository.read_after(None, filters=[("asset", "BTC")], as_df=True)
+            run["rows"] = len(df)
+    await client.client.aclose()
+
+
+def bench_deribit(timer: Timer, runs: int):
+    asyncio.run(_bench_deribit(timer, runs))
+
+
+BENCHMARKS = {
+    "coinglass": bench_coinglass,
+    "coinmarketcap": bench_coinmarketcap,
+    "deribit": bench_deribit,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--targets", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--output", help="Result file, defaults to benchmarks/results")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    database_url = use_database()
+    create_tables()
+    os.environ.pop("ARISTA_HTTP_CACHE", None)
+    os.environ.setdefault("COINGLASS_API_KEY", "benchmark")
+    os.environ.setdefault("COINMARKETCAP_API_KEY", "benchmark")
+
+    from arista.mock import MockAPIServer
+
+    results = {}
+    with MockAPIServer(now=NOW) as server:
+        os.environ.update(server.env())
+        for target in args.targets:
+            timer = Timer()
+            BENCHMARKS[target](timer, args.runs)
+            results[target] = timer.summary()
+
+    print_summary(results)
+    dialect = database_url.split(":")[0]
+    path = write_results(
+        "ingestion",
+        {"database": dialect, "runs": args.runs, "results": results},
+        args.output,
+    )
+    print(f"Results written to {path}")
+    if args.compare:
+        baseline = json.loads(open(args.compare).read())["results"]
+        print("\n".join(compare(baseline, results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Micro benchmarks of `BaseRepository` on large synthetic tables.
+
+Loads `open_interest` and `deribit_futures` shaped tables of the given sizes
+through `bulk_create` and times the read paths on them. Every operation reports
+its duration, rows and the peak resident memory of the process while it ran,
+which shows at which table size the ORM paths (`read_all`, `where`) stop being
+viable. Operations returning full tables are skipped above `--max-orm-rows`,
+and `iter_pages` reads `--page-size` rows per page.
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.repositories --rows 1000000 10000000
+"""
+
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import compare, create_tables, use_database, write_results
+
+CHUNK_SIZE = 100_000
+ORM_SAMPLE = 100_000
+START = datetime(2020, 1, 1)
+WHERE_IN_KEYS = 20_000
+
+
+class PeakMemory:
+    """Sample the resident set size in a background thread to find its peak."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    @staticmethod
+    def rss() -> int:
+        """Current resident set size in bytes."""
+        try:
+            pages = int(Path("/proc/self/statm").read_text().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            import resource
+
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.rss())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = self.rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.rss())
+
+
+def measure(func, *args, **kwargs) -> tuple[dict, object]:
+    """Run `func` once and return its duration, rows and peak memory."""
+    with PeakMemory() as memory:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+    rows = result if isinstance(result, int) else _len(result)
+    stats = {
+        "seconds": seconds,
+        "rows": rows,
+        "rows_per_sec": rows / seconds if rows and seconds else None,
+        "peak_rss_mb": memory.peak / 2**20,
+    }
+    return stats, result
+
+
+def _len(result) -> int:
+    try:
+        return len(result)
+    except TypeError:
+        return 1 if result is not None else 0
+
+
+def _chunked(records, rows: int):
+    """Yield the first `rows` records in lists of `CHUNK_SIZE`."""
+    chunk = []
+    for i, record in enumerate(records):
+        if i == rows:
+            break
+        chunk.append(record)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def open_interest_chunks(rows: int, symbols: int = 200):
+    """Records of `symbols` series at a 12h cadence."""
+    from arista.models.open_interest import OpenInterestRecord
+
+    names = ["BTC", "ETH"] + [f"S{i:03d}" for i in range(symbols - 2)]
+
+    def records():
+        for step in itertools.count():
+            at = START + timedelta(hours=12 * step)
+            timestamp = int(at.timestamp())
+            for name in names:
+                yield OpenInterestRecord(name, float(step), timestamp, at, "bench")
+
+    return _chunked(records(), rows)
+
+
+def deribit_chunks(rows: int):
+    """Records of BTC and ETH futures at a 6h cadence."""
+    from arista.api.deribit import Future
+    from arista.models.deribit import DeribitFutureRecord
+
+    series = [(asset, future.value) for asset in ["BTC", "ETH"] for future in Future]
+    prices = np.random.default_rng(0).lognormal(10, 0.1, size=CHUNK_SIZE)
+
+    def records():
+        for step in itertools.count():
+            at = START + timedelta(hours=6 * step)
+            timestamp = int(at.timestamp())
+            for asset, future in series:
+                price = float(prices[step % CHUNK_SIZE])
+                yield DeribitFutureRecord(
+                    asset, f"{asset}-{future}", future, None, price, timestamp, at
+                )
+
+    return _chunked(records(), rows)
+
+
+def load(repository, chunks) -> int:
+    total = 0
+    for chunk in chunks:
+        repository.bulk_create(chunk)
+        total += len(chunk)
+    return total
+
+
+def clear(repository):
+    from sqlalchemy import delete
+
+    repository._session.execute(delete(repository._model))
+    repository._session.commit()
+
+
+def bench_table(table: str, rows: int, max_orm_rows: int, page_size: int) -> dict:
+    from arista.models import DeribitFuturesRepository, OpenInterestRepository
+
+    if table == "open_interest":
+        repository, chunks = OpenInterestRepository(), open_interest_chunks
+        key, values, col = "symbol", ["BTC", "ETH", "S000", "S001"], "unix_timestamp"
+    else:
+        repository, chunks = DeribitFuturesRepository(), deribit_chunks
+        key, values, col = "future_reference", ["perpetual", "quarter_1"], "datetime_"
+    clear(repository)
+
+    results = {}
+    sample = next(chunks(min(rows, ORM_SAMPLE)))
+    models = [repository._model(**record._asdict()) for record in sample]
+
+    def create_models():
+        repository.bulk_create(models)
+        return len(models)
+
+    results["bulk_create_models"], _ = measure(create_models)
+    clear(repository)
+    results["bulk_create_records"], _ = measure(load, repository, chunks(rows))
+
+    latest = repository.max(col, None)
+    if isinstance(latest, datetime):
+        last_day = latest - timedelta(days=1)
+    else:
+        last_day = latest - 86400
+    timestamps = repository.where(
+        [], order_by=f"-{col}", limit=WHERE_IN_KEYS, columns=[col]
+    )
+    timestamps = [row[0] for row in timestamps]
+    operations = {
+        "max_timestamp": lambda: repository.max_timestamp(col=col),
+        "max_timestamp_filtered": lambda: repository.max_timestamp(
+            col=col, filters=[(key, values[0])]
+        ),
+        "where": lambda: repository.where([(key, values[0])]),
+        "where_in": lambda: repository.where_in(key, values),
+        "read_after_last_day": lambda: repository.read_after(last_day, col=col),
+        "read_last_100": lambda: repository.read_last(100, col=col),
+        "read_all_df": lambda: repository.read_all(as_df=True),
+        "where_in_stream_20k_keys": lambda: sum(
+            1 for _ in repository.where_in(col, timestamps, stream=True)
+        ),
+        "iter_pages": lambda: sum(
+            len(page.rows) for page in repository.iter_pages(page_size, col=col)
+        ),
+    }
+    full_table = {"where", "where_in", "read_all_df"}
+    for name, operation in operations.items():
+        if name in full_table and rows > max_orm_rows:
+            results[name] = {"skipped": f"more than {max_orm_rows} rows"}
+            continue
+        results[name], _ = measure(operation)
+        # release the ORM identity map between operations
+        repository._session.expunge_all()
+    return results
+
+
+def print_results(results: dict):
+    print(
+        f"{'table':<18}{'rows':>12}  {'operation':<26}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}"
+    )
+    for table, sizes in results.items():
+        for rows, operations in sizes.items():
+            for name, stats in operations.items():
+                if "skipped" in stats:
+                    print(f"{table:<18}{rows:>12}  {name:<26}{'skipped':>10}")
+                    continue
+                print(
+                    f"{table:<18}{rows:>12}  {name:<26}{stats['seconds']:>10.3f}"
+                    f"{stats['rows_per_sec'] or 0:>14,.0f}{stats['peak_rss_mb']:>10.0f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--page-size", type=int, default=10_000)
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=["open_interest", "deribit_futures"],
+        default=["open_interest", "deribit_futures"],
+    )
+    parser.add_argument("--max-orm-rows", type=int, default=10_000_000)
+    parser.add_argument("--output", help="Result file, defaults to benchmarks/results")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    database_url = use_database()
+    create_tables()
+
+    results = {}
+    for table in args.tables:
+        results[table] = {}
+        for rows in args.rows:
+            print(f"Benchmarking {table} with {rows:,} rows")
+            results[table][str(rows)] = bench_table(
+                table, rows, args.max_orm_rows, args.page_size
+            )
+
+    print_results(results)
+    path = write_results(
+        "repositories",
+        {
+            "database": database_url.split(":")[0],
+            "page_size": args.page_size,
+            "results": results,
+        },
+        args.output,
+    )
+    print(f"Results written to {path}")
+    if args.compare:
+        baseline = json.loads(open(args.compare).read())["results"]
+        print("\n".join(compare(baseline, results)))
+
+
+if __name__ == "__main__":
+    main()
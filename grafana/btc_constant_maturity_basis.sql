@@ -0,0 +1,12 @@
+-- constant maturity annualised basis, interpolated between the two
+-- expiries bracketing each tenor (see arista.analytics.constant_maturity)
+select
+	datetime_,
+	max(case when tenor = 30 then basis end) as btc_30d_annualised_basis,
+	max(case when tenor = 60 then basis end) as btc_60d_annualised_basis,
+	max(case when tenor = 90 then basis end) as btc_90d_annualised_basis
+from constant_maturity_basis
+where
+	asset = 'BTC'
+group by datetime_
+order by datetime_
@@ -0,0 +1,10 @@
+-- latest price per Deribit instrument, one index walk over
+-- ix_deribit_futures_instrument_unix_timestamp (see BaseRepository.latest)
+select distinct on (instrument)
+	instrument,
+	asset,
+	future_reference,
+	price,
+	datetime_
+from deribit_futures
+order by instrument, unix_timestamp desc, id desc
@@ -0,0 +1,12 @@
+-- rows written per table and minute, from the counters the scheduler
+-- snapshots into the metrics table (see arista.metrics)
+select
+	utc,
+	labels::json ->> 'table' as "table",
+	value - lag(value) over (partition by labels order by utc) as rows_written
+from metrics
+where
+	name = 'arista_rows_written_total'
+	and process = 'scheduler'
+	and $__timeFilter(utc)
+order by utc